@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Mapping
 from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, fields
 from decimal import Decimal
 from pathlib import Path
+from typing import Any
 
 from delivery_sim import (
     STATUS_LABELS,
@@ -21,54 +23,114 @@ from models import (
     Shipment,
     ShipmentRepository,
     async_session,
+    engine,
     init_db,
+    warm_pool,
 )
 from sendparcel.enums import ShipmentStatus
 from sendparcel.flow import ShipmentFlow
 from sendparcel.registry import registry
 from sendparcel.types import AddressInfo, ParcelInfo
-from sqlalchemy import func, select
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
 # --- Register the simulator provider ---
 registry.register(DeliverySimProvider)
 
+# Providers are registered once at import time, so the form choices and
+# the fallback provider slug never change while the app is running.
+PROVIDER_CHOICES = tuple(registry.get_choices())
+DEFAULT_PROVIDER = PROVIDER_CHOICES[0][0]
+
 # --- Weight presets ---
 WEIGHT_BY_SIZE: dict[str, Decimal] = {
     "S": Decimal("0.5"),
     "M": Decimal("1.0"),
     "L": Decimal("2.5"),
 }
+DEFAULT_WEIGHT = WEIGHT_BY_SIZE["M"]
+
+# Number of most recent shipments listed on the home page
+HOME_PAGE_SIZE = 100
+
+
+# --- Form parsing ---
+@dataclass(frozen=True, slots=True)
+class ShipmentForm:
+    """Free-text fields of the new shipment form."""
+
+    sender_name: str = ""
+    sender_line1: str = ""
+    sender_city: str = ""
+    sender_postal_code: str = ""
+    recipient_name: str = ""
+    recipient_email: str = ""
+    recipient_phone: str = ""
+    recipient_line1: str = ""
+    recipient_city: str = ""
+    recipient_postal_code: str = ""
+
+    @classmethod
+    def from_form(cls, form: Mapping[str, Any]) -> ShipmentForm:
+        """Read every field in one pass, defaulting missing ones to ``""``."""
+        return cls(**{name: str(form.get(name, "")) for name in _FORM_FIELDS})
+
+
+_FORM_FIELDS = tuple(field.name for field in fields(ShipmentForm))
+
+
+# --- Template globals ---
+# Tabler badge color for each shipment status
+STATUS_COLORS: dict[str, str] = {
+    ShipmentStatus.NEW: "secondary",
+    ShipmentStatus.CREATED: "info",
+    ShipmentStatus.LABEL_READY: "cyan",
+    ShipmentStatus.IN_TRANSIT: "blue",
+    ShipmentStatus.OUT_FOR_DELIVERY: "indigo",
+    ShipmentStatus.DELIVERED: "success",
+    ShipmentStatus.CANCELLED: "warning",
+    ShipmentStatus.FAILED: "danger",
+    ShipmentStatus.RETURNED: "orange",
+}
 
 
-# --- Template helpers ---
-def status_label(status: str) -> str:
-    """Human-readable label for a shipment status."""
-    return STATUS_LABELS.get(status, status)
+def register_template_globals(template_engine: JinjaTemplateEngine) -> None:
+    """Expose the status lookup tables to every template."""
+    template_engine.engine.globals["STATUS_LABELS"] = STATUS_LABELS
+    template_engine.engine.globals["STATUS_COLORS"] = STATUS_COLORS
 
 
-def status_color(status: str) -> str:
-    """Tabler badge color for a shipment status."""
-    colors: dict[str, str] = {
-        ShipmentStatus.NEW: "secondary",
-        ShipmentStatus.CREATED: "info",
-        ShipmentStatus.LABEL_READY: "cyan",
-        ShipmentStatus.IN_TRANSIT: "blue",
-        ShipmentStatus.OUT_FOR_DELIVERY: "indigo",
-        ShipmentStatus.DELIVERED: "success",
-        ShipmentStatus.CANCELLED: "warning",
-        ShipmentStatus.FAILED: "danger",
-        ShipmentStatus.RETURNED: "orange",
-    }
-    return colors.get(status, "secondary")
+def warm_template_cache(template_engine: JinjaTemplateEngine) -> None:
+    """Compile every template up front so first requests only render."""
+    for name in template_engine.engine.list_templates():
+        template_engine.get_template(name)
 
 
-# --- Lifespan: init DB ---
+# --- Lifespan: init DB, warm the connection pool and template cache ---
 @asynccontextmanager
 async def lifespan(app: Litestar) -> AsyncGenerator[None, None]:
     await init_db()
+    await warm_pool()
+    warm_template_cache(app.template_engine)
     yield
+    await engine.dispose()
+
+
+# --- Lookup helpers ---
+async def get_shipment_or_404(
+    session: AsyncSession, shipment_id: int
+) -> Shipment:
+    """Load a shipment by primary key or raise 404.
+
+    ``session.get`` consults the session identity map first, so repeated
+    lookups within one request do not hit the database again.
+    """
+    shipment = await session.get(Shipment, shipment_id)
+    if shipment is None:
+        raise NotFoundException(detail="Shipment not found")
+    return shipment
 
 
 # --- Route handlers ---
@@ -76,29 +138,22 @@ async def lifespan(app: Litestar) -> AsyncGenerator[None, None]:
 
 @get("/")
 async def home() -> Template:
-    """Render shipment list."""
+    """Render the most recent shipments."""
+    stmt = select(Shipment).order_by(Shipment.id.desc()).limit(HOME_PAGE_SIZE)
     async with async_session() as session:
-        result = await session.execute(
-            select(Shipment).order_by(Shipment.id.desc())
-        )
-        shipments = result.scalars().all()
+        shipments = (await session.scalars(stmt)).all()
     return Template(
         template_name="home.html",
-        context={
-            "shipments": shipments,
-            "status_label": status_label,
-            "status_color": status_color,
-        },
+        context={"shipments": shipments},
     )
 
 
 @get("/shipments/new")
 async def shipment_new() -> Template:
     """Render new shipment form."""
-    providers = registry.get_choices()
     return Template(
         template_name="delivery_gateway.html",
-        context={"providers": providers},
+        context={"providers": PROVIDER_CHOICES},
     )
 
 
@@ -107,32 +162,30 @@ async def shipment_create(request: Request) -> Redirect:
     """Create a new shipment from form submission."""
     form = await request.form()
     package_size = str(form.get("package_size", "M"))
-    weight = WEIGHT_BY_SIZE.get(package_size, Decimal("1.0"))
-    provider_slug = str(form.get("provider", registry.get_choices()[0][0]))
+    weight = WEIGHT_BY_SIZE.get(package_size, DEFAULT_WEIGHT)
+    provider_slug = str(form.get("provider", DEFAULT_PROVIDER))
+
+    data = ShipmentForm.from_form(form)
 
     sender_address = AddressInfo(
-        name=str(form.get("sender_name", "")),
-        line1=str(form.get("sender_line1", "")),
-        city=str(form.get("sender_city", "")),
-        postal_code=str(form.get("sender_postal_code", "")),
+        name=data.sender_name,
+        line1=data.sender_line1,
+        city=data.sender_city,
+        postal_code=data.sender_postal_code,
         country_code="PL",
     )
     receiver_address = AddressInfo(
-        name=str(form.get("recipient_name", "")),
-        email=str(form.get("recipient_email", "")),
-        phone=str(form.get("recipient_phone", "")),
-        line1=str(form.get("recipient_line1", "")),
-        city=str(form.get("recipient_city", "")),
-        postal_code=str(form.get("recipient_postal_code", "")),
+        name=data.recipient_name,
+        email=data.recipient_email,
+        phone=data.recipient_phone,
+        line1=data.recipient_line1,
+        city=data.recipient_city,
+        postal_code=data.recipient_postal_code,
         country_code="PL",
     )
     parcels = [ParcelInfo(weight_kg=weight)]
 
     async with async_session() as session:
-        count_result = await session.execute(select(func.count(Shipment.id)))
-        count = count_result.scalar() or 0
-        reference_id = f"SHP-{count + 1:04d}"
-
         repo = ShipmentRepository(session)
         flow = ShipmentFlow(repository=repo)
         shipment = await flow.create_shipment(
@@ -140,20 +193,21 @@ async def shipment_create(request: Request) -> Redirect:
             sender_address=sender_address,
             receiver_address=receiver_address,
             parcels=parcels,
-            reference_id=reference_id,
         )
 
+        # The primary key is assigned on insert, so derive the reference
+        # from it instead of counting existing rows beforehand.
+        shipment.reference_id = f"SHP-{shipment.id:04d}"
+
         # Store address and parcel data on the example model
-        shipment.sender_name = str(form.get("sender_name", ""))
-        shipment.sender_street = str(form.get("sender_line1", ""))
-        shipment.sender_city = str(form.get("sender_city", ""))
-        shipment.sender_postal_code = str(form.get("sender_postal_code", ""))
-        shipment.receiver_name = str(form.get("recipient_name", ""))
-        shipment.receiver_street = str(form.get("recipient_line1", ""))
-        shipment.receiver_city = str(form.get("recipient_city", ""))
-        shipment.receiver_postal_code = str(
-            form.get("recipient_postal_code", "")
-        )
+        shipment.sender_name = data.sender_name
+        shipment.sender_street = data.sender_line1
+        shipment.sender_city = data.sender_city
+        shipment.sender_postal_code = data.sender_postal_code
+        shipment.receiver_name = data.recipient_name
+        shipment.receiver_street = data.recipient_line1
+        shipment.receiver_city = data.recipient_city
+        shipment.receiver_postal_code = data.recipient_postal_code
         shipment.weight = weight
 
         with suppress(NotImplementedError):
@@ -166,16 +220,10 @@ async def shipment_create(request: Request) -> Redirect:
 async def shipment_detail(shipment_id: int) -> Template:
     """Render shipment detail page."""
     async with async_session() as session:
-        shipment = await session.get(Shipment, shipment_id)
-        if shipment is None:
-            raise NotFoundException(detail="Shipment not found")
+        shipment = await get_shipment_or_404(session, shipment_id)
     return Template(
         template_name="shipment_detail.html",
-        context={
-            "shipment": shipment,
-            "status_label": status_label,
-            "status_color": status_color,
-        },
+        context={"shipment": shipment},
     )
 
 
@@ -185,7 +233,7 @@ async def shipment_create_label(shipment_id: int) -> Redirect:
     async with async_session() as session:
         repo = ShipmentRepository(session)
         flow = ShipmentFlow(repository=repo)
-        shipment = await repo.get_by_id(str(shipment_id))
+        shipment = await get_shipment_or_404(session, shipment_id)
         with suppress(NotImplementedError):
             shipment = await flow.create_label(shipment)
         await session.commit()
@@ -198,17 +246,13 @@ async def shipment_refresh_status(shipment_id: int) -> Template:
     async with async_session() as session:
         repo = ShipmentRepository(session)
         flow = ShipmentFlow(repository=repo)
-        shipment = await repo.get_by_id(str(shipment_id))
+        shipment = await get_shipment_or_404(session, shipment_id)
         shipment = await flow.fetch_and_update_status(shipment)
         await session.commit()
 
         return Template(
             template_name="partials/status_badge.html",
-            context={
-                "shipment": shipment,
-                "status_label": status_label,
-                "status_color": status_color,
-            },
+            context={"shipment": shipment},
         )
 
 
@@ -227,6 +271,7 @@ app = Litestar(
     template_config=TemplateConfig(
         engine=JinjaTemplateEngine,
         directory=TEMPLATES_DIR,
+        engine_callback=register_template_globals,
     ),
     lifespan=[lifespan],
     debug=True,
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from typing import ClassVar
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Annotated, ClassVar
 from uuid import uuid4
 
 from litestar import Response, Router, get, post
+from litestar.params import Parameter
 from litestar.response import Template
 from sendparcel.enums import ShipmentStatus
 from sendparcel.provider import (
@@ -20,8 +24,26 @@ from sendparcel.types import (
     ShipmentStatusResponse,
 )
 
+# Upper bound on the number of shipments the simulator remembers.
+SIM_STATE_MAXSIZE = 10_000
+
+
+class _SimState(OrderedDict[str, str]):
+    """Simulator state that evicts the least recently written shipments."""
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 # In-memory store for simulator state keyed by shipment.id
-_sim_state: dict[str, str] = {}
+_sim_state = _SimState(maxsize=SIM_STATE_MAXSIZE)
 
 
 class DeliverySimProvider(
@@ -75,28 +97,33 @@ class DeliverySimProvider(
 # --- Status progression helpers ---
 
 # Allowed forward transitions for the control panel
-_NEXT_STATUSES: dict[str, list[str]] = {
-    ShipmentStatus.CREATED: [
+_NEXT_STATUSES: dict[str, tuple[str, ...]] = {
+    ShipmentStatus.CREATED: (
         ShipmentStatus.LABEL_READY,
         ShipmentStatus.CANCELLED,
         ShipmentStatus.FAILED,
-    ],
-    ShipmentStatus.LABEL_READY: [
+    ),
+    ShipmentStatus.LABEL_READY: (
         ShipmentStatus.IN_TRANSIT,
         ShipmentStatus.CANCELLED,
         ShipmentStatus.FAILED,
-    ],
-    ShipmentStatus.IN_TRANSIT: [
+    ),
+    ShipmentStatus.IN_TRANSIT: (
         ShipmentStatus.OUT_FOR_DELIVERY,
         ShipmentStatus.DELIVERED,
         ShipmentStatus.RETURNED,
         ShipmentStatus.FAILED,
-    ],
-    ShipmentStatus.OUT_FOR_DELIVERY: [
+    ),
+    ShipmentStatus.OUT_FOR_DELIVERY: (
         ShipmentStatus.DELIVERED,
         ShipmentStatus.RETURNED,
         ShipmentStatus.FAILED,
-    ],
+    ),
+}
+
+# Same transitions as sets, for constant-time validation in sim_advance
+_NEXT_STATUSES_SET: dict[str, frozenset[str]] = {
+    status: frozenset(options) for status, options in _NEXT_STATUSES.items()
 }
 
 # Human-readable status labels
@@ -112,68 +139,108 @@ STATUS_LABELS: dict[str, str] = {
     ShipmentStatus.RETURNED: "Returned",
 }
 
+# Control panel options per status, rendered once for the templates
+_NEXT_OPTIONS: dict[str, tuple[dict[str, str], ...]] = {
+    status: tuple(
+        {"value": option, "label": STATUS_LABELS.get(option, option)}
+        for option in options
+    )
+    for status, options in _NEXT_STATUSES.items()
+}
+
 
 def get_sim_status(shipment_id: str) -> str:
     """Get current simulator status for a shipment."""
     return _sim_state.get(shipment_id, ShipmentStatus.NEW)
 
 
-def get_next_statuses(current: str) -> list[str]:
-    """Get list of allowed next statuses from current."""
-    return _NEXT_STATUSES.get(current, [])
+def get_next_statuses(current: str) -> tuple[str, ...]:
+    """Get allowed next statuses from current, in display order."""
+    return _NEXT_STATUSES.get(current, ())
 
 
 # --- PDF label generation helpers ---
 
 
+_PDF_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
+
+
 def _pdf_escape(value: str) -> str:
     """Escape special PDF string characters."""
-    return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return value.translate(_PDF_ESCAPE_TABLE)
+
+
+_PDF_HEADER = b"%PDF-1.4\n"
+_PDF_CATALOG = b"<< /Type /Catalog /Pages 2 0 R >>"
+_PDF_PAGES = b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>"
+_PDF_PAGE = (
+    b"<< /Type /Page /Parent 2 0 R "
+    b"/MediaBox [0 0 595 842] "
+    b"/Resources << /Font << /F1 5 0 R >> >> "
+    b"/Contents 4 0 R >>"
+)
+_PDF_FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+_PDF_OBJECT_COUNT = 5
+
+
+def _pdf_object(index: int, body: bytes) -> bytes:
+    """Wrap ``body`` as indirect object number ``index``."""
+    return b"%d 0 obj\n%b\nendobj\n" % (index, body)
+
+
+def _build_pdf_head() -> tuple[bytes, tuple[int, ...]]:
+    """Assemble the invariant objects 1-3 and record their offsets."""
+    head = _PDF_HEADER
+    offsets: list[int] = []
+    for index, body in enumerate((_PDF_CATALOG, _PDF_PAGES, _PDF_PAGE), 1):
+        offsets.append(len(head))
+        head += _pdf_object(index, body)
+    # The content stream (object 4) always starts right after the head.
+    offsets.append(len(head))
+    return head, tuple(offsets)
+
+
+# Everything except the content stream is identical for every label, so
+# the invariant parts are built once at import time.
+_PDF_HEAD, _PDF_HEAD_OFFSETS = _build_pdf_head()
+_PDF_FONT_OBJECT = _pdf_object(_PDF_OBJECT_COUNT, _PDF_FONT)
+_PDF_XREF_ENTRY = b"%010d 00000 n \n"
+# xref table up to and including object 4; only object 5 moves per label
+_PDF_XREF_HEAD = b"xref\n0 %d\n0000000000 65535 f \n%b" % (
+    _PDF_OBJECT_COUNT + 1,
+    b"".join(_PDF_XREF_ENTRY % offset for offset in _PDF_HEAD_OFFSETS),
+)
+_PDF_TRAILER = b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n" % (
+    _PDF_OBJECT_COUNT + 1
+)
 
 
 def _build_label_pdf(text: str) -> bytes:
     """Generate a minimal valid PDF with the given text."""
-    stream = (f"BT /F1 14 Tf 72 760 Td ({_pdf_escape(text)}) Tj ET").encode()
-    objects = [
-        b"<< /Type /Catalog /Pages 2 0 R >>",
-        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
-        (
-            b"<< /Type /Page /Parent 2 0 R "
-            b"/MediaBox [0 0 595 842] "
-            b"/Resources << /Font << /F1 5 0 R >> >> "
-            b"/Contents 4 0 R >>"
-        ),
-        (
-            b"<< /Length "
-            + str(len(stream)).encode("ascii")
-            + b" >>\nstream\n"
-            + stream
-            + b"\nendstream"
-        ),
-        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
-    ]
-
-    pdf = bytearray(b"%PDF-1.4\n")
-    offsets: list[int] = []
-    for index, obj in enumerate(objects, start=1):
-        offsets.append(len(pdf))
-        pdf.extend(f"{index} 0 obj\n".encode("ascii"))
-        pdf.extend(obj)
-        pdf.extend(b"\nendobj\n")
-
-    xref_offset = len(pdf)
-    pdf.extend(f"xref\n0 {len(objects) + 1}\n".encode("ascii"))
-    pdf.extend(b"0000000000 65535 f \n")
-    for off in offsets:
-        pdf.extend(f"{off:010} 00000 n \n".encode("ascii"))
-    pdf.extend(
+    stream = b"BT /F1 14 Tf 72 760 Td (%b) Tj ET" % _pdf_escape(text).encode()
+    content = _pdf_object(
+        4,
+        b"<< /Length %d >>\nstream\n%b\nendstream" % (len(stream), stream),
+    )
+    font_offset = len(_PDF_HEAD) + len(content)
+    xref_offset = font_offset + len(_PDF_FONT_OBJECT)
+    return b"".join(
         (
-            f"trailer\n<< /Size {len(objects) + 1} "
-            f"/Root 1 0 R >>\n"
-            f"startxref\n{xref_offset}\n%%EOF\n"
-        ).encode("ascii")
+            _PDF_HEAD,
+            content,
+            _PDF_FONT_OBJECT,
+            _PDF_XREF_HEAD,
+            _PDF_XREF_ENTRY % font_offset,
+            _PDF_TRAILER,
+            b"%d\n%%%%EOF\n" % xref_offset,
+        )
     )
-    return bytes(pdf)
+
+
+@lru_cache(maxsize=256)
+def _label_pdf_for(shipment_id: str) -> bytes:
+    """Return the (cached) label PDF for a simulated shipment."""
+    return _build_label_pdf(f"Shipment label {shipment_id}")
 
 
 # --- Litestar routes for the simulator control panel ---
@@ -184,17 +251,13 @@ async def sim_panel(shipment_id: int) -> Template:
     """Render simulator control panel partial (HTMX target)."""
     sid = str(shipment_id)
     current = get_sim_status(sid)
-    next_options = get_next_statuses(current)
     return Template(
         template_name="partials/sim_panel.html",
         context={
             "shipment_id": shipment_id,
             "current_status": current,
             "current_label": STATUS_LABELS.get(current, current),
-            "next_options": [
-                {"value": s, "label": STATUS_LABELS.get(s, s)}
-                for s in next_options
-            ],
+            "next_options": _NEXT_OPTIONS.get(current, ()),
         },
     )
 
@@ -205,38 +268,54 @@ async def sim_advance(shipment_id: int, data: dict) -> Template:
     sid = str(shipment_id)
     new_status = data.get("status", "")
     current = get_sim_status(sid)
-    allowed = get_next_statuses(current)
-    if new_status in allowed:
-        _sim_state[sid] = new_status
-
-    current = get_sim_status(sid)
-    next_options = get_next_statuses(current)
+    # No await between the check and the write, so the transition cannot
+    # interleave with another request on the same event loop.
+    if new_status in _NEXT_STATUSES_SET.get(current, frozenset()):
+        _sim_state[sid] = current = new_status
     return Template(
         template_name="partials/sim_panel.html",
         context={
             "shipment_id": shipment_id,
             "current_status": current,
             "current_label": STATUS_LABELS.get(current, current),
-            "next_options": [
-                {"value": s, "label": STATUS_LABELS.get(s, s)}
-                for s in next_options
-            ],
+            "next_options": _NEXT_OPTIONS.get(current, ()),
         },
     )
 
 
+# Labels are derived from the shipment id alone, so clients and proxies
+# may keep them indefinitely.
+_LABEL_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def _label_etag(shipment_id: str) -> str:
+    """Strong ETag for the label of ``shipment_id``."""
+    digest = hashlib.blake2b(shipment_id.encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
 @get("/sim/label/{shipment_id:str}")
-async def sim_label(shipment_id: str) -> Response:
+async def sim_label(
+    shipment_id: str,
+    if_none_match: Annotated[
+        str | None, Parameter(header="If-None-Match")
+    ] = None,
+) -> Response:
     """Return a generated PDF label for a simulated shipment."""
     # Strip .pdf extension if present (URL pattern is /sim/label/{id}.pdf)
     clean_id = shipment_id.removesuffix(".pdf")
-    label_text = f"Shipment label {clean_id}"
-    pdf_bytes = _build_label_pdf(label_text)
+    etag = _label_etag(clean_id)
+    headers = {"Cache-Control": _LABEL_CACHE_CONTROL, "ETag": etag}
+    if if_none_match is not None and etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    ):
+        return Response(b"", status_code=304, headers=headers)
     return Response(
-        pdf_bytes,
+        _label_pdf_for(clean_id),
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f'inline; filename="label-{clean_id}.pdf"'
+            **headers,
+            "Content-Disposition": f'inline; filename="label-{clean_id}.pdf"',
         },
     )
 
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import re
+from contextlib import AsyncExitStack
+from datetime import datetime
 from decimal import Decimal
+from typing import Any, ClassVar
 
-from sqlalchemy import DateTime, Numeric, String
+from sqlalchemy import CHAR, DateTime, Numeric, String, event, func
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -15,8 +18,12 @@ from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
     mapped_column,
+    validates,
 )
 
+# ISO 3166-1 alpha-2, e.g. "PL"
+_COUNTRY_CODE_RE = re.compile(r"[A-Z]{2}")
+
 
 class Base(DeclarativeBase):
     pass
@@ -26,6 +33,7 @@ class Shipment(Base):
     """Shipment model with inline address and parcel data."""
 
     __tablename__ = "shipments"
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     reference_id: Mapped[str] = mapped_column(String(100), default="")
@@ -35,14 +43,14 @@ class Shipment(Base):
     sender_street: Mapped[str] = mapped_column(String(500), default="")
     sender_city: Mapped[str] = mapped_column(String(255), default="")
     sender_postal_code: Mapped[str] = mapped_column(String(20), default="")
-    sender_country_code: Mapped[str] = mapped_column(String(2), default="PL")
+    sender_country_code: Mapped[str] = mapped_column(CHAR(2), default="PL")
 
     # Receiver address
     receiver_name: Mapped[str] = mapped_column(String(255), default="")
     receiver_street: Mapped[str] = mapped_column(String(500), default="")
     receiver_city: Mapped[str] = mapped_column(String(255), default="")
     receiver_postal_code: Mapped[str] = mapped_column(String(20), default="")
-    receiver_country_code: Mapped[str] = mapped_column(String(2), default="PL")
+    receiver_country_code: Mapped[str] = mapped_column(CHAR(2), default="PL")
 
     # Parcel dimensions
     weight: Mapped[Decimal] = mapped_column(
@@ -67,14 +75,28 @@ class Shipment(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(tz=UTC),
+        default=func.now(),
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(tz=UTC),
-        onupdate=lambda: datetime.now(tz=UTC),
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
     )
 
+    @validates("sender_country_code", "receiver_country_code")
+    def _validate_country_code(self, key: str, value: str) -> str:
+        if not _COUNTRY_CODE_RE.fullmatch(value):
+            raise ValueError(f"{key} must be an ISO 3166-1 alpha-2 code")
+        return value
+
+
+# Column attribute names accepted as extra fields by update_status
+_SHIPMENT_COLUMNS = frozenset(
+    attr.key for attr in Shipment.__mapper__.column_attrs
+)
+
 
 class ShipmentRepository:
     """Async SQLAlchemy repository implementing ShipmentRepository protocol."""
@@ -82,27 +104,41 @@ class ShipmentRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def get_by_id(self, shipment_id: str) -> Shipment:
-        result = await self.session.get(Shipment, int(shipment_id))
+    async def get_by_id(self, shipment_id: int | str) -> Shipment:
+        pk = shipment_id if isinstance(shipment_id, int) else int(shipment_id)
+        result = await self.session.get(Shipment, pk)
         if result is None:
             raise KeyError(f"Shipment {shipment_id} not found")
         return result
 
-    async def create(self, **kwargs) -> Shipment:
+    async def create(
+        self,
+        *,
+        reference_id: str = "",
+        status: str = "new",
+        provider: str = "",
+        external_id: str = "",
+        tracking_number: str = "",
+        label_url: str = "",
+        **_ignored,
+    ) -> Shipment:
         shipment = Shipment(
-            reference_id=str(kwargs.get("reference_id", "")),
-            status=str(kwargs.get("status", "new")),
-            provider=str(kwargs.get("provider", "")),
-            external_id=str(kwargs.get("external_id", "")),
-            tracking_number=str(kwargs.get("tracking_number", "")),
-            label_url=str(kwargs.get("label_url", "")),
+            reference_id=reference_id,
+            # The flow passes a ShipmentStatus member; store its value.
+            status=str(status),
+            provider=provider,
+            external_id=external_id,
+            tracking_number=tracking_number,
+            label_url=label_url,
         )
         self.session.add(shipment)
         await self.session.flush()
         return shipment
 
     async def save(self, shipment: Shipment) -> Shipment:
-        self.session.add(shipment)
+        # Shipments loaded through this session are already tracked.
+        if shipment not in self.session:
+            self.session.add(shipment)
         await self.session.flush()
         return shipment
 
@@ -112,17 +148,56 @@ class ShipmentRepository:
         shipment = await self.get_by_id(shipment_id)
         shipment.status = status
         for key, value in fields.items():
-            if hasattr(shipment, key):
+            if key in _SHIPMENT_COLUMNS:
                 setattr(shipment, key, value)
         await self.session.flush()
         return shipment
 
 
-engine = create_async_engine("sqlite+aiosqlite:///example.db")
+# Connections kept open in the pool between requests
+POOL_SIZE = 5
+# Seconds a connection waits on another writer's lock before failing
+SQLITE_BUSY_TIMEOUT = 30
+
+engine = create_async_engine(
+    "sqlite+aiosqlite:///example.db",
+    pool_size=POOL_SIZE,
+    max_overflow=10,
+    connect_args={"timeout": SQLITE_BUSY_TIMEOUT},
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
+# Applied to every new connection: WAL lets readers proceed during writes
+# and synchronous=NORMAL drops the per-commit fsync that WAL makes safe.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",
+    "foreign_keys=ON",
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
 
 async def init_db() -> None:
     """Create all tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_pool() -> None:
+    """Open ``POOL_SIZE`` connections up front.
+
+    Connections return to the pool on exit, so the first requests do not
+    pay the connection setup cost.
+    """
+    async with AsyncExitStack() as stack:
+        for _ in range(POOL_SIZE):
+            await stack.enter_async_context(engine.connect())
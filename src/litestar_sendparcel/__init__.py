@@ -6,11 +6,15 @@ from typing import TYPE_CHECKING
 __version__ = "0.1.0"
 
 __all__ = [
+    "Address",
+    "BatchCallbackRetryStore",
+    "BulkShipmentRepository",
     "CallbackResponse",
     "CallbackRetryStore",
     "ConfigurationError",
     "CreateShipmentRequest",
     "LitestarPluginRegistry",
+    "Parcel",
     "SendparcelConfig",
     "ShipmentNotFoundError",
     "ShipmentResponse",
@@ -25,11 +29,17 @@ if TYPE_CHECKING:
         ShipmentNotFoundError,
     )
     from litestar_sendparcel.plugin import create_shipping_router
-    from litestar_sendparcel.protocols import CallbackRetryStore
+    from litestar_sendparcel.protocols import (
+        BatchCallbackRetryStore,
+        BulkShipmentRepository,
+        CallbackRetryStore,
+    )
     from litestar_sendparcel.registry import LitestarPluginRegistry
     from litestar_sendparcel.schemas import (
+        Address,
         CallbackResponse,
         CreateShipmentRequest,
+        Parcel,
         ShipmentResponse,
     )
 
@@ -56,11 +66,17 @@ def __getattr__(name: str):
         from litestar_sendparcel.exceptions import ConfigurationError
 
         return ConfigurationError
-    if name == "CallbackRetryStore":
+    if name in (
+        "CallbackRetryStore",
+        "BatchCallbackRetryStore",
+        "BulkShipmentRepository",
+    ):
         from litestar_sendparcel import protocols
 
         return getattr(protocols, name)
     if name in (
+        "Address",
+        "Parcel",
         "CreateShipmentRequest",
         "ShipmentResponse",
         "CallbackResponse",
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import cache
 from typing import Any
 
 from pydantic import Field
@@ -14,7 +15,7 @@ class SendparcelConfig(BaseSettings):
     Reads from environment variables with SENDPARCEL_ prefix.
     """
 
-    model_config = SettingsConfigDict(env_prefix="SENDPARCEL_")
+    model_config = SettingsConfigDict(env_prefix="SENDPARCEL_", frozen=True)
 
     default_provider: str
     providers: dict[str, dict[str, Any]] = Field(default_factory=dict)
@@ -23,3 +24,16 @@ class SendparcelConfig(BaseSettings):
     retry_max_attempts: int = 5
     retry_backoff_seconds: int = 60
     retry_enabled: bool = True
+    retry_concurrency: int = Field(default=1, ge=1)
+
+
+@cache
+def get_config() -> SendparcelConfig:
+    """Return the environment-backed config, built on first use.
+
+    Reading ``SENDPARCEL_*`` variables walks ``os.environ``, so code that
+    needs the config outside app startup should call this instead of
+    constructing ``SendparcelConfig`` each time.  Call
+    ``get_config.cache_clear()`` after changing the environment.
+    """
+    return SendparcelConfig()
@@ -1,11 +1,51 @@
 """SQLAlchemy 2.0 async models for shipment processing."""
 
 import uuid
-from datetime import UTC, datetime
-from typing import Any
+from datetime import datetime
+from typing import Any, ClassVar
 
-from sqlalchemy import JSON, DateTime, String, Text
+import msgspec
+from sqlalchemy import DateTime, Dialect, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
+
+
+def _new_id() -> str:
+    """Generate a primary key for a new row.
+
+    Keys are drawn straight from ``uuid4`` on every insert rather than
+    from a pre-generated pool, which would hand out duplicates in
+    workers forked after the pool was filled.
+    """
+    return str(uuid.uuid4())
+
+
+class _JSONText(TypeDecorator[Any]):
+    """JSON stored as text, encoded with msgspec instead of stdlib json.
+
+    msgspec already ships with Litestar. PostgreSQL gets a native
+    ``JSONB`` column through a type variant instead.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    _encoder = msgspec.json.Encoder()
+    _decoder = msgspec.json.Decoder()
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> str | None:
+        if value is None:
+            return None
+        return self._encoder.encode(value).decode()
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        return self._decoder.decode(value)
+
+
+_JSON_PAYLOAD = _JSONText().with_variant(JSONB(), "postgresql")
 
 
 class Base(DeclarativeBase):
@@ -16,11 +56,15 @@ class ShipmentModel(Base):
     """Shipment record implementing the ShipmentRepository protocol."""
 
     __tablename__ = "sendparcel_shipments"
+    # Timestamps come from the database clock. INSERTs send now() inline
+    # so tables created without a server default still work, and the
+    # values are fetched back so detached instances never need a refresh.
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=_new_id,
     )
     reference_id: Mapped[str] = mapped_column(
         String(255), index=True, default=""
@@ -32,12 +76,14 @@ class ShipmentModel(Base):
     label_url: Mapped[str] = mapped_column(String(512), default="")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(tz=UTC),
+        default=func.now(),
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(tz=UTC),
-        onupdate=lambda: datetime.now(tz=UTC),
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
     )
 
 
@@ -45,16 +91,26 @@ class CallbackRetryModel(Base):
     """Webhook callback retry queue entry."""
 
     __tablename__ = "sendparcel_callback_retries"
+    # Serves get_due_retries: equality on status, then an ordered range
+    # scan over next_retry_at.
+    __table_args__ = (
+        Index(
+            "ix_sendparcel_callback_retries_status_next_retry_at",
+            "status",
+            "next_retry_at",
+        ),
+    )
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=_new_id,
     )
     shipment_id: Mapped[str] = mapped_column(String(36), index=True)
     provider_slug: Mapped[str] = mapped_column(String(64))
-    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
-    headers: Mapped[dict[str, Any]] = mapped_column(JSON)
+    payload: Mapped[dict[str, Any]] = mapped_column(_JSON_PAYLOAD)
+    headers: Mapped[dict[str, Any]] = mapped_column(_JSON_PAYLOAD)
     attempts: Mapped[int] = mapped_column(default=0)
     next_retry_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True, default=None
@@ -65,5 +121,6 @@ class CallbackRetryModel(Base):
     status: Mapped[str] = mapped_column(String(20), default="pending")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(tz=UTC),
+        default=func.now(),
+        server_default=func.now(),
     )
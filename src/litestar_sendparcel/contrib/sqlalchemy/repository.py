@@ -1,22 +1,67 @@
 """SQLAlchemy 2.0 async ShipmentRepository implementation."""
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
 
 from litestar_sendparcel.contrib.sqlalchemy.models import ShipmentModel
 
+# Column attribute names accepted as extra fields by update_status
+_SHIPMENT_COLUMNS = frozenset(
+    attr.key for attr in ShipmentModel.__mapper__.column_attrs
+)
+
+
+def _without_expire_on_commit(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> async_sessionmaker[AsyncSession]:
+    """Return a factory whose sessions keep attributes loaded on commit.
+
+    Shipments are handed back to callers after the session commits, so
+    expiring them would only force a reload on the next attribute read.
+    Factories already configured with ``expire_on_commit=False`` are
+    used as-is; others are copied rather than reconfigured in place.
+    """
+    if session_factory.kw.get("expire_on_commit") is False:
+        return session_factory
+    return async_sessionmaker(
+        class_=session_factory.class_,
+        **{**session_factory.kw, "expire_on_commit": False},
+    )
+
 
 class SQLAlchemyShipmentRepository:
     """Shipment repository backed by SQLAlchemy async sessions.
 
-    Implements the ShipmentRepository protocol from sendparcel.
+    Implements the ShipmentRepository protocol from sendparcel. Sessions
+    are always opened with ``expire_on_commit=False``; a factory that
+    expires on commit is copied with that option turned off.
     """
 
     def __init__(
         self,
         session_factory: async_sessionmaker[AsyncSession],
     ) -> None:
-        self._session_factory = session_factory
+        self._session_factory = _without_expire_on_commit(session_factory)
+
+    @classmethod
+    def from_engine(cls, engine: AsyncEngine) -> SQLAlchemyShipmentRepository:
+        """Create a repository bound to a shared, pooled engine.
+
+        Every call opens a short-lived session, but sessions borrow
+        connections from the engine's pool, so one engine should be
+        shared for the whole process rather than created per request.
+        """
+        return cls(async_sessionmaker(engine, expire_on_commit=False))
 
     async def get_by_id(self, shipment_id: str) -> ShipmentModel:
         """Get a shipment by ID. Raises KeyError if not found."""
@@ -27,26 +72,63 @@ class SQLAlchemyShipmentRepository:
             session.expunge(result)
             return result
 
+    async def get_many(self, ids: Sequence[str]) -> dict[str, ShipmentModel]:
+        """Get the shipments matching ``ids`` in one query, keyed by ID."""
+        if not ids:
+            return {}
+        stmt = select(ShipmentModel).where(ShipmentModel.id.in_(set(ids)))
+        async with self._session_factory() as session:
+            shipments = (await session.scalars(stmt)).all()
+            session.expunge_all()
+            return {shipment.id: shipment for shipment in shipments}
+
     async def create(self, **kwargs) -> ShipmentModel:
         """Create a new shipment record."""
         # Ensure status is a string
         if "status" in kwargs:
             kwargs["status"] = str(kwargs["status"])
+        shipment = ShipmentModel(**kwargs)
         async with self._session_factory() as session:
-            shipment = ShipmentModel(**kwargs)
             session.add(shipment)
-            await session.commit()
-            await session.refresh(shipment)
+            # eager_defaults loads the server-side values during the flush,
+            # with RETURNING on dialects that support it.
+            await session.flush()
+            # Detach before committing so the returned row is not expired.
             session.expunge(shipment)
+            await session.commit()
             return shipment
 
+    async def bulk_create(
+        self, records: Sequence[Mapping[str, Any]]
+    ) -> list[ShipmentModel]:
+        """Create several shipment records with a single INSERT.
+
+        Returned shipments are in the same order as ``records``.
+        """
+        if not records:
+            return []
+        rows = [
+            {**record, "status": str(record["status"])}
+            if "status" in record
+            else dict(record)
+            for record in records
+        ]
+        stmt = insert(ShipmentModel).returning(
+            ShipmentModel, sort_by_parameter_order=True
+        )
+        async with self._session_factory() as session:
+            shipments = list(await session.scalars(stmt, rows))
+            session.expunge_all()
+            await session.commit()
+            return shipments
+
     async def save(self, shipment: ShipmentModel) -> ShipmentModel:
         """Save an existing shipment (merge and commit)."""
         async with self._session_factory() as session:
             merged = await session.merge(shipment)
-            await session.commit()
-            await session.refresh(merged)
+            await session.flush()
             session.expunge(merged)
+            await session.commit()
             return merged
 
     async def update_status(
@@ -55,18 +137,39 @@ class SQLAlchemyShipmentRepository:
         status: str,
         **fields,
     ) -> ShipmentModel:
-        """Update shipment status and optional extra fields."""
+        """Update shipment status and optional extra fields.
+
+        Issues a single ``UPDATE ... RETURNING`` instead of loading the
+        row, mutating it and reloading it after the commit. Dialects
+        without ``UPDATE ... RETURNING`` (MySQL, MariaDB, SQLite before
+        3.35) load the row, mutate it and flush instead.
+        """
+        values = {
+            key: value
+            for key, value in fields.items()
+            if key in _SHIPMENT_COLUMNS
+        }
+        stmt = (
+            update(ShipmentModel)
+            .where(ShipmentModel.id == shipment_id)
+            .values(status=status, **values)
+            .returning(ShipmentModel)
+        )
         async with self._session_factory() as session:
-            shipment = await session.get(ShipmentModel, shipment_id)
+            if session.get_bind().dialect.update_returning:
+                shipment = (await session.scalars(stmt)).one_or_none()
+            else:
+                shipment = await session.get(ShipmentModel, shipment_id)
+                if shipment is not None:
+                    shipment.status = status
+                    for key, value in values.items():
+                        setattr(shipment, key, value)
+                    await session.flush()
             if shipment is None:
                 raise KeyError(shipment_id)
-            shipment.status = status
-            for key, value in fields.items():
-                if hasattr(shipment, key):
-                    setattr(shipment, key, value)
-            await session.commit()
-            await session.refresh(shipment)
+            # Detach before committing so the returned row is not expired.
             session.expunge(shipment)
+            await session.commit()
             return shipment
 
     async def list_by_reference(self, reference_id: str) -> list[ShipmentModel]:
@@ -75,8 +178,26 @@ class SQLAlchemyShipmentRepository:
             stmt = select(ShipmentModel).where(
                 ShipmentModel.reference_id == reference_id
             )
-            result = await session.execute(stmt)
-            shipments = list(result.scalars().all())
-            for s in shipments:
-                session.expunge(s)
+            shipments = list((await session.scalars(stmt)).all())
+            session.expunge_all()
             return shipments
+
+    async def list_by_references(
+        self, reference_ids: Sequence[str]
+    ) -> dict[str, list[ShipmentModel]]:
+        """List shipments for several references in one query.
+
+        Returns a mapping of reference ID to its shipments; references
+        without shipments are omitted.
+        """
+        if not reference_ids:
+            return {}
+        stmt = select(ShipmentModel).where(
+            ShipmentModel.reference_id.in_(set(reference_ids))
+        )
+        grouped: defaultdict[str, list[ShipmentModel]] = defaultdict(list)
+        async with self._session_factory() as session:
+            for shipment in await session.scalars(stmt):
+                grouped[shipment.reference_id].append(shipment)
+            session.expunge_all()
+        return dict(grouped)
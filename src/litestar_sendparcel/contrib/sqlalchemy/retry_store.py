@@ -1,5 +1,6 @@
 """SQLAlchemy-backed retry store for webhook callbacks."""
 
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from typing import Any
 
@@ -7,6 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from litestar_sendparcel.contrib.sqlalchemy.models import CallbackRetryModel
+from litestar_sendparcel.protocols import RetryTransition
 from litestar_sendparcel.retry import compute_next_retry_at
 
 
@@ -53,54 +55,66 @@ class SQLAlchemyRetryStore:
     async def get_due_retries(self, limit: int = 10) -> list[dict[str, Any]]:
         """Get retries that are due for processing."""
         now = datetime.now(tz=UTC)
-        async with self._session_factory() as session:
-            stmt = (
-                select(CallbackRetryModel)
-                .where(CallbackRetryModel.status == "pending")
-                .where(CallbackRetryModel.next_retry_at <= now)
-                .order_by(CallbackRetryModel.next_retry_at.asc())
-                .limit(limit)
+        # Project only the columns callers need instead of hydrating
+        # full ORM objects and copying them into dicts afterwards.
+        stmt = (
+            select(
+                CallbackRetryModel.id,
+                CallbackRetryModel.shipment_id,
+                CallbackRetryModel.provider_slug,
+                CallbackRetryModel.payload,
+                CallbackRetryModel.headers,
+                CallbackRetryModel.attempts,
             )
+            .where(CallbackRetryModel.status == "pending")
+            .where(CallbackRetryModel.next_retry_at <= now)
+            .order_by(CallbackRetryModel.next_retry_at.asc())
+            .limit(limit)
+        )
+        async with self._session_factory() as session:
             result = await session.execute(stmt)
-            retries = result.scalars().all()
-            return [
-                {
-                    "id": r.id,
-                    "shipment_id": r.shipment_id,
-                    "provider_slug": r.provider_slug,
-                    "payload": r.payload,
-                    "headers": r.headers,
-                    "attempts": r.attempts,
-                }
-                for r in retries
-            ]
+            return [dict(row) for row in result.mappings()]
 
     async def mark_succeeded(self, retry_id: str) -> None:
         """Mark a retry as successfully processed."""
-        async with self._session_factory() as session:
-            retry = await session.get(CallbackRetryModel, retry_id)
-            if retry is not None:
-                retry.status = "succeeded"
-                await session.commit()
+        await self.mark_many([(retry_id, "succeeded", None)])
 
     async def mark_failed(self, retry_id: str, error: str) -> None:
         """Mark a retry as failed and schedule next attempt."""
-        async with self._session_factory() as session:
-            retry = await session.get(CallbackRetryModel, retry_id)
-            if retry is not None:
-                retry.attempts += 1
-                retry.last_error = error
-                retry.next_retry_at = compute_next_retry_at(
-                    attempt=retry.attempts + 1,
-                    backoff_seconds=self._backoff_seconds,
-                )
-                retry.status = "pending"
-                await session.commit()
+        await self.mark_many([(retry_id, "failed", error)])
 
     async def mark_exhausted(self, retry_id: str) -> None:
         """Mark a retry as exhausted (dead letter)."""
+        await self.mark_many([(retry_id, "exhausted", None)])
+
+    async def mark_many(self, transitions: Sequence[RetryTransition]) -> None:
+        """Apply a batch of retry transitions in one session and commit.
+
+        Unknown retry IDs are skipped, as with the single ``mark_*``
+        methods.
+        """
+        if not transitions:
+            return
+        ids = {retry_id for retry_id, _, _ in transitions}
+        stmt = select(CallbackRetryModel).where(CallbackRetryModel.id.in_(ids))
         async with self._session_factory() as session:
-            retry = await session.get(CallbackRetryModel, retry_id)
-            if retry is not None:
-                retry.status = "exhausted"
-                await session.commit()
+            retries = {retry.id: retry for retry in await session.scalars(stmt)}
+            if not retries:
+                return
+            now = datetime.now(tz=UTC)
+            for retry_id, state, error in transitions:
+                retry = retries.get(retry_id)
+                if retry is None:
+                    continue
+                if state == "failed":
+                    retry.attempts += 1
+                    retry.last_error = error
+                    retry.next_retry_at = compute_next_retry_at(
+                        attempt=retry.attempts + 1,
+                        backoff_seconds=self._backoff_seconds,
+                        now=now,
+                    )
+                    retry.status = "pending"
+                else:
+                    retry.status = state
+            await session.commit()
@@ -24,62 +24,37 @@ class ConfigurationError(Exception):
         super().__init__(message)
 
 
-def _error_response(
-    request: Request, detail: str, code: str, status_code: int
-) -> Response:
+# Exception type -> (error code, HTTP status). Litestar picks the handler
+# for the closest registered base class; handle_exception repeats that walk
+# over the exception's MRO to find the matching row.
+_ERROR_TABLE: dict[type[Exception], tuple[str, int]] = {
+    CommunicationError: ("communication_error", 502),
+    InvalidCallbackError: ("invalid_callback", 400),
+    InvalidTransitionError: ("invalid_transition", 409),
+    ShipmentNotFoundError: ("not_found", 404),
+    ConfigurationError: ("configuration_error", 500),
+    SendParcelException: ("sendparcel_error", 400),
+}
+
+
+def handle_exception(request: Request, exc: Exception) -> Response:
+    """Map a sendparcel or adapter exception to a JSON error response."""
+    code, status_code = next(
+        _ERROR_TABLE[cls] for cls in type(exc).__mro__ if cls in _ERROR_TABLE
+    )
     return Response(
-        content={"detail": detail, "code": code},
+        content={"detail": str(exc), "code": code},
         status_code=status_code,
     )
 
 
-def handle_communication_error(
-    request: Request, exc: CommunicationError
-) -> Response:
-    """Map CommunicationError to 502."""
-    return _error_response(request, str(exc), "communication_error", 502)
-
-
-def handle_invalid_callback(
-    request: Request, exc: InvalidCallbackError
-) -> Response:
-    """Map InvalidCallbackError to 400."""
-    return _error_response(request, str(exc), "invalid_callback", 400)
-
-
-def handle_invalid_transition(
-    request: Request, exc: InvalidTransitionError
-) -> Response:
-    """Map InvalidTransitionError to 409."""
-    return _error_response(request, str(exc), "invalid_transition", 409)
+# Per-exception names from 0.1.0, kept for code that registers or wraps
+# the handlers individually.
+handle_communication_error = handle_exception
+handle_invalid_callback = handle_exception
+handle_invalid_transition = handle_exception
+handle_shipment_not_found = handle_exception
+handle_configuration_error = handle_exception
+handle_sendparcel_exception = handle_exception
 
-
-def handle_shipment_not_found(
-    request: Request, exc: ShipmentNotFoundError
-) -> Response:
-    """Map ShipmentNotFoundError to 404."""
-    return _error_response(request, str(exc), "not_found", 404)
-
-
-def handle_configuration_error(
-    request: Request, exc: ConfigurationError
-) -> Response:
-    """Map ConfigurationError to 500."""
-    return _error_response(request, str(exc), "configuration_error", 500)
-
-
-def handle_sendparcel_exception(
-    request: Request, exc: SendParcelException
-) -> Response:
-    """Map generic SendParcelException to 400."""
-    return _error_response(request, str(exc), "sendparcel_error", 400)
-
-
-EXCEPTION_HANDLERS = {
-    CommunicationError: handle_communication_error,
-    InvalidCallbackError: handle_invalid_callback,
-    InvalidTransitionError: handle_invalid_transition,
-    ShipmentNotFoundError: handle_shipment_not_found,
-    ConfigurationError: handle_configuration_error,
-    SendParcelException: handle_sendparcel_exception,
-}
+EXCEPTION_HANDLERS = dict.fromkeys(_ERROR_TABLE, handle_exception)
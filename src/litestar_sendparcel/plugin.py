@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from litestar import Router
 from litestar.di import Provide
+from sendparcel.flow import ShipmentFlow
 from sendparcel.protocols import ShipmentRepository
 
 from litestar_sendparcel.config import SendparcelConfig
@@ -12,6 +13,18 @@ from litestar_sendparcel.protocols import CallbackRetryStore
 from litestar_sendparcel.registry import LitestarPluginRegistry
 from litestar_sendparcel.routes.callbacks import CallbackController
 from litestar_sendparcel.routes.shipments import ShipmentController
+from litestar_sendparcel.schemas import CreateShipmentRequest
+
+_ROUTE_HANDLERS = (ShipmentController, CallbackController)
+
+
+def _provide_value(value: object) -> Provide:
+    """Provide a fixed object to every request.
+
+    The value is cached on the provider, so after the first request
+    Litestar returns it without calling the dependency at all.
+    """
+    return Provide(lambda: value, use_cache=True, sync_to_thread=False)
 
 
 def create_shipping_router(
@@ -34,21 +47,27 @@ def create_shipping_router(
     """
     actual_registry = registry or LitestarPluginRegistry()
     actual_registry.discover()
+    # Build the deferred request validator now, at startup, instead of on
+    # the first shipment request.
+    CreateShipmentRequest.model_rebuild()
+    # The flow only holds the repository and provider config, both fixed
+    # for the router's lifetime, so one instance serves every request.
+    flow = ShipmentFlow(repository=repository, config=config.providers)
+
+    dependencies = {
+        "config": _provide_value(config),
+        "repository": _provide_value(repository),
+        "flow": _provide_value(flow),
+        "registry": _provide_value(actual_registry),
+    }
+    # Handlers default retry_store to None, so an unconfigured store needs
+    # no provider to run on every request.
+    if retry_store is not None:
+        dependencies["retry_store"] = _provide_value(retry_store)
 
     return Router(
         path="/",
-        route_handlers=[
-            ShipmentController,
-            CallbackController,
-        ],
-        dependencies={
-            "config": Provide(lambda: config, sync_to_thread=False),
-            "repository": Provide(lambda: repository, sync_to_thread=False),
-            "registry": Provide(
-                lambda: actual_registry,
-                sync_to_thread=False,
-            ),
-            "retry_store": Provide(lambda: retry_store, sync_to_thread=False),
-        },
+        route_handlers=_ROUTE_HANDLERS,
+        dependencies=dependencies,
         exception_handlers=EXCEPTION_HANDLERS,
     )
@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Any, Protocol, runtime_checkable
+from collections.abc import Sequence
+from typing import Any, Literal, Protocol, runtime_checkable
 
 __all__ = [
+    "BatchCallbackRetryStore",
+    "BulkShipmentRepository",
     "CallbackRetryStore",
+    "RetryTransition",
+]
+
+# (retry ID, new state, error message for "failed" transitions)
+RetryTransition = tuple[
+    str, Literal["succeeded", "failed", "exhausted"], str | None
 ]
 
 
@@ -42,3 +51,32 @@ class CallbackRetryStore(Protocol):
     async def mark_exhausted(self, retry_id: str) -> None:
         """Mark a retry as exhausted (dead letter)."""
         ...
+
+
+@runtime_checkable
+class BatchCallbackRetryStore(Protocol):
+    """Optional retry store extension for batched state updates.
+
+    Stores that implement it receive a whole retry batch's outcomes in
+    one call instead of one ``mark_*`` call per retry.
+    """
+
+    async def mark_many(self, transitions: Sequence[RetryTransition]) -> None:
+        """Apply transitions in order, as the matching ``mark_*`` would."""
+        ...
+
+
+@runtime_checkable
+class BulkShipmentRepository(Protocol):
+    """Optional repository extension for batched shipment reads.
+
+    Repositories that implement it let the retry worker load every
+    shipment in a batch with one query instead of one per retry.
+    """
+
+    async def get_many(self, ids: Sequence[str]) -> dict[str, Any]:
+        """Return the shipments found for ``ids``, keyed by ID.
+
+        Missing IDs are left out of the result rather than raising.
+        """
+        ...
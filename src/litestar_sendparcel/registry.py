@@ -1,5 +1,8 @@
 """Litestar-aware registry."""
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from sendparcel.registry import PluginRegistry
 
 
@@ -8,10 +11,26 @@ class LitestarPluginRegistry(PluginRegistry):
 
     def __init__(self) -> None:
         super().__init__()
-        self._provider_routers: dict[str, object] = {}
+        self._provider_routers: Mapping[str, object] = {}
+        self._frozen = False
 
     def register_provider_router(self, slug: str, router: object) -> None:
-        self._provider_routers[slug] = router
+        if self._frozen:
+            raise RuntimeError(
+                "Cannot register provider routers after freeze()"
+            )
+        # Copy on write: registration only happens during startup.
+        self._provider_routers = {**self._provider_routers, slug: router}
 
     def get_provider_router(self, slug: str) -> object | None:
         return self._provider_routers.get(slug)
+
+    def freeze(self) -> None:
+        """Make provider routers read-only once startup is complete.
+
+        Lookups then read an immutable snapshot, and late registrations
+        fail loudly instead of racing with request handling.
+        """
+        if not self._frozen:
+            self._provider_routers = MappingProxyType(self._provider_routers)
+            self._frozen = True
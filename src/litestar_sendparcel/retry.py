@@ -3,27 +3,54 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
+from collections.abc import Mapping
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Any, cast
 
+import anyio
+from sendparcel.exceptions import InvalidCallbackError
 from sendparcel.flow import ShipmentFlow
 from sendparcel.protocols import ShipmentRepository
 
 from litestar_sendparcel.config import SendparcelConfig
-from litestar_sendparcel.protocols import CallbackRetryStore
+from litestar_sendparcel.protocols import (
+    BatchCallbackRetryStore,
+    BulkShipmentRepository,
+    CallbackRetryStore,
+    RetryTransition,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _backoff_delay(attempt: int, backoff_seconds: int) -> timedelta:
+    """Return the backoff delay for an attempt, memoized per setting.
+
+    Attempts are bounded by ``retry_max_attempts``, so only a handful of
+    distinct delays are ever built.
+    """
+    return timedelta(seconds=backoff_seconds << max(attempt - 1, 0))
+
+
 def compute_next_retry_at(
     attempt: int,
     backoff_seconds: int,
+    *,
+    now: datetime | None = None,
 ) -> datetime:
     """Compute the next retry time with exponential backoff.
 
     delay = backoff_seconds * 2^(attempt - 1)
+
+    ``now`` defaults to the current UTC time; callers scheduling several
+    retries at once can pass a single timestamp.
     """
-    delay = backoff_seconds * (2 ** (attempt - 1))
-    return datetime.now(tz=UTC) + timedelta(seconds=delay)
+    if now is None:
+        now = datetime.now(tz=UTC)
+    return now + _backoff_delay(attempt, backoff_seconds)
 
 
 async def enqueue_callback_retry(
@@ -32,7 +59,7 @@ async def enqueue_callback_retry(
     provider_slug: str,
     shipment_id: str,
     payload: dict,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     reason: str,
 ) -> None:
     """Persist callback retry payload when a retry store is configured."""
@@ -43,7 +70,7 @@ async def enqueue_callback_retry(
         shipment_id=shipment_id,
         provider_slug=provider_slug,
         payload=payload,
-        headers=headers,
+        headers=dict(headers),
     )
     logger.warning(
         "Callback for shipment %s failed, queued for retry: %s",
@@ -61,83 +88,206 @@ async def process_due_retries(
 ) -> int:
     """Process all due callback retries.
 
+    Retries run one at a time unless ``config.retry_concurrency`` is
+    raised, in which case the repository and retry store must tolerate
+    concurrent calls; repositories bound to a single session do not.
+
+    A retry that raises does not stop the rest of the batch; once every
+    retry has run, the first such error is re-raised as is.
+
     Returns the number of retries processed.
     """
     retries = await retry_store.get_due_retries(limit=limit)
-    processed = 0
+    if not retries:
+        return 0
 
-    for retry in retries:
-        retry_id = retry["id"]
-        shipment_id = retry["shipment_id"]
-        payload = retry["payload"]
-        headers = retry["headers"]
-        attempts = retry["attempts"]
+    flow = ShipmentFlow(
+        repository=repository,
+        config=config.providers,
+    )
+    limiter = anyio.CapacityLimiter(config.retry_concurrency)
+
+    # Load every shipment the batch will replay in one call when the
+    # repository supports it; otherwise each retry fetches its own.
+    shipments: dict[str, Any] | None = None
+    if isinstance(repository, BulkShipmentRepository):
+        shipments = await repository.get_many(
+            [
+                retry["shipment_id"]
+                for retry in retries
+                if retry["attempts"] < config.retry_max_attempts
+            ]
+        )
+
+    # Stores with mark_many get the batch's outcomes in one write after
+    # every retry has run; others are updated as each retry finishes.
+    recorder: _TransitionRecorder | None = None
+    if isinstance(retry_store, BatchCallbackRetryStore):
+        recorder = _TransitionRecorder()
+
+    outcomes: Counter[str] = Counter()
+    errors: list[Exception] = []
+
+    async def _process(retry: dict[str, Any]) -> None:
+        async with limiter:
+            try:
+                outcome = await _process_retry(
+                    retry,
+                    retry_store=recorder or retry_store,
+                    repository=repository,
+                    shipments=shipments,
+                    flow=flow,
+                    max_attempts=config.retry_max_attempts,
+                )
+            except Exception as exc:
+                # Contained so the task group does not cancel the other
+                # retries; only the first error is re-raised, so later
+                # ones are logged here.
+                if errors:
+                    logger.exception("Retry %s: processing failed", retry["id"])
+                errors.append(exc)
+                return
+        outcomes[outcome] += 1
+
+    try:
+        async with anyio.create_task_group() as tg:
+            for retry in retries:
+                tg.start_soon(_process, retry)
+    finally:
+        # Flush even when a retry raised or the batch was cancelled, so
+        # callbacks that were already replayed are not marked due again
+        # and replayed on the next run.
+        if recorder is not None and recorder.transitions:
+            with anyio.CancelScope(shield=True):
+                await cast(BatchCallbackRetryStore, retry_store).mark_many(
+                    recorder.transitions
+                )
+
+    logger.info(
+        "Processed %d callback retries: %d succeeded, %d failed, %d exhausted",
+        len(retries),
+        outcomes["succeeded"],
+        outcomes["failed"],
+        outcomes["exhausted"],
+    )
+    if errors:
+        raise errors[0]
+    return len(retries)
+
+
+class _TransitionRecorder:
+    """Collects ``mark_*`` calls for a single ``mark_many`` flush."""
+
+    __slots__ = ("transitions",)
+
+    def __init__(self) -> None:
+        self.transitions: list[RetryTransition] = []
+
+    async def mark_succeeded(self, retry_id: str) -> None:
+        self.transitions.append((retry_id, "succeeded", None))
+
+    async def mark_failed(self, retry_id: str, error: str) -> None:
+        self.transitions.append((retry_id, "failed", error))
+
+    async def mark_exhausted(self, retry_id: str) -> None:
+        self.transitions.append((retry_id, "exhausted", None))
 
-        if attempts >= config.retry_max_attempts:
-            logger.warning(
-                "Retry exhausted for shipment %s after %d attempts",
-                shipment_id,
-                attempts,
-            )
-            await retry_store.mark_exhausted(retry_id)
-            processed += 1
-            continue
 
+async def _process_retry(
+    retry: dict[str, Any],
+    *,
+    retry_store: CallbackRetryStore | _TransitionRecorder,
+    repository: ShipmentRepository,
+    shipments: dict[str, Any] | None,
+    flow: ShipmentFlow,
+    max_attempts: int,
+) -> str:
+    """Replay a single stored callback and record the outcome.
+
+    Returns the outcome name used for the batch summary.
+    """
+    retry_id = retry["id"]
+    shipment_id = retry["shipment_id"]
+    payload = retry["payload"]
+    headers = retry["headers"]
+    attempts = retry["attempts"]
+
+    if attempts >= max_attempts:
+        logger.warning(
+            "Retry exhausted for shipment %s after %d attempts",
+            shipment_id,
+            attempts,
+        )
+        await retry_store.mark_exhausted(retry_id)
+        return "exhausted"
+
+    if shipments is not None:
+        shipment = shipments.get(shipment_id)
+    else:
         try:
             shipment = await repository.get_by_id(shipment_id)
         except KeyError:
-            logger.error(
-                "Retry %s: shipment %s not found, marking exhausted",
-                retry_id,
-                shipment_id,
-            )
-            await retry_store.mark_exhausted(retry_id)
-            processed += 1
-            continue
-
-        flow = ShipmentFlow(
-            repository=repository,
-            config=config.providers,
+            shipment = None
+    if shipment is None:
+        logger.error(
+            "Retry %s: shipment %s not found, marking exhausted",
+            retry_id,
+            shipment_id,
         )
+        await retry_store.mark_exhausted(retry_id)
+        return "exhausted"
 
-        try:
-            await flow.handle_callback(
-                shipment,
-                payload,
-                headers,
+    try:
+        await flow.handle_callback(
+            shipment,
+            payload,
+            headers,
+        )
+        await retry_store.mark_succeeded(retry_id)
+        logger.debug(
+            "Retry %s: callback for shipment %s succeeded",
+            retry_id,
+            shipment_id,
+        )
+        return "succeeded"
+    except InvalidCallbackError as exc:
+        # A callback the provider rejects will be rejected on every
+        # replay, so it is dead-lettered without using up more attempts.
+        logger.warning(
+            "Retry %s: callback for shipment %s rejected, not retrying: %s",
+            retry_id,
+            shipment_id,
+            exc,
+        )
+        await retry_store.mark_failed(
+            retry_id,
+            error=str(exc),
+        )
+        await retry_store.mark_exhausted(retry_id)
+        return "exhausted"
+    except Exception as exc:
+        new_attempts = attempts + 1
+        if new_attempts >= max_attempts:
+            logger.warning(
+                "Retry exhausted for shipment %s after %d attempts: %s",
+                shipment_id,
+                new_attempts,
+                exc,
             )
-            await retry_store.mark_succeeded(retry_id)
-            logger.info(
-                "Retry %s: callback for shipment %s succeeded",
+            await retry_store.mark_failed(
                 retry_id,
-                shipment_id,
+                error=str(exc),
             )
-        except Exception as exc:
-            new_attempts = attempts + 1
-            if new_attempts >= config.retry_max_attempts:
-                logger.warning(
-                    "Retry exhausted for shipment %s after %d attempts: %s",
-                    shipment_id,
-                    new_attempts,
-                    exc,
-                )
-                await retry_store.mark_failed(
-                    retry_id,
-                    error=str(exc),
-                )
-                await retry_store.mark_exhausted(retry_id)
-            else:
-                await retry_store.mark_failed(
-                    retry_id,
-                    error=str(exc),
-                )
-                logger.info(
-                    "Retry %s: attempt %d failed: %s",
-                    retry_id,
-                    new_attempts,
-                    exc,
-                )
-
-        processed += 1
-
-    return processed
+            await retry_store.mark_exhausted(retry_id)
+            return "exhausted"
+        await retry_store.mark_failed(
+            retry_id,
+            error=str(exc),
+        )
+        logger.debug(
+            "Retry %s: attempt %d failed: %s",
+            retry_id,
+            new_attempts,
+            exc,
+        )
+        return "failed"
@@ -3,15 +3,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Annotated, ClassVar
+from typing import Annotated
 
 from litestar import Controller, Request, post
 from litestar.params import Dependency
+from litestar.serialization import decode_json
 from sendparcel.exceptions import CommunicationError, InvalidCallbackError
 from sendparcel.flow import ShipmentFlow
 from sendparcel.protocols import ShipmentRepository
 
-from litestar_sendparcel.config import SendparcelConfig
 from litestar_sendparcel.exceptions import ShipmentNotFoundError
 from litestar_sendparcel.protocols import CallbackRetryStore
 from litestar_sendparcel.retry import enqueue_callback_retry
@@ -24,7 +24,7 @@ class CallbackController(Controller):
     """Provider callback endpoints."""
 
     path = "/callbacks"
-    tags: ClassVar[list[str]] = ["callbacks"]
+    tags = ("callbacks",)
 
     @post("/{provider_slug:str}/{shipment_id:str}")
     async def handle_callback(
@@ -32,28 +32,28 @@ class CallbackController(Controller):
         provider_slug: str,
         shipment_id: str,
         request: Request,
-        config: Annotated[SendparcelConfig, Dependency(skip_validation=True)],
         repository: Annotated[
             ShipmentRepository, Dependency(skip_validation=True)
         ],
+        flow: Annotated[ShipmentFlow, Dependency(skip_validation=True)],
         retry_store: Annotated[
             CallbackRetryStore | None,
             Dependency(skip_validation=True),
         ] = None,
     ) -> CallbackResponse:
         """Handle provider callback using core flow and retry hooks."""
-        flow = ShipmentFlow(repository=repository, config=config.providers)
-
         try:
             shipment = await repository.get_by_id(shipment_id)
         except KeyError as exc:
             raise ShipmentNotFoundError(shipment_id) from exc
 
-        if str(shipment.provider) != provider_slug:
+        if shipment.provider != provider_slug:
             raise InvalidCallbackError("Provider slug mismatch")
 
         raw_body = await request.body()
-        payload = await request.json()
+        # Decode the bytes already in hand with Litestar's shared decoder
+        # rather than going back through request.json().
+        payload = decode_json(raw_body or b"null")
         headers = dict(request.headers)
 
         try:
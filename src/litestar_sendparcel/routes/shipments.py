@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Annotated, ClassVar
+from typing import Annotated
 
 from litestar import Controller, get, post
 from litestar.params import Dependency
@@ -24,7 +24,7 @@ class ShipmentController(Controller):
     """Shipment CRUD endpoints."""
 
     path = "/shipments"
-    tags: ClassVar[list[str]] = ["shipments"]
+    tags = ("shipments",)
 
     @get("/health")
     async def shipments_health(self) -> dict[str, str]:
@@ -39,6 +39,7 @@ class ShipmentController(Controller):
         repository: Annotated[
             ShipmentRepository, Dependency(skip_validation=True)
         ],
+        flow: Annotated[ShipmentFlow, Dependency(skip_validation=True)],
     ) -> ShipmentResponse:
         """Create a shipment via ShipmentFlow.
 
@@ -46,8 +47,6 @@ class ShipmentController(Controller):
         Optionally accepts ``reference_id`` for external reference tracking.
         """
         provider_slug = data.provider or config.default_provider
-        flow = ShipmentFlow(repository=repository, config=config.providers)
-
         if (
             data.sender_address is not None
             and data.receiver_address is not None
@@ -70,13 +69,12 @@ class ShipmentController(Controller):
     async def create_label(
         self,
         shipment_id: str,
-        config: Annotated[SendparcelConfig, Dependency(skip_validation=True)],
         repository: Annotated[
             ShipmentRepository, Dependency(skip_validation=True)
         ],
+        flow: Annotated[ShipmentFlow, Dependency(skip_validation=True)],
     ) -> ShipmentResponse:
         """Create shipment label via provider."""
-        flow = ShipmentFlow(repository=repository, config=config.providers)
         try:
             shipment = await repository.get_by_id(shipment_id)
         except KeyError as exc:
@@ -88,13 +86,12 @@ class ShipmentController(Controller):
     async def fetch_status(
         self,
         shipment_id: str,
-        config: Annotated[SendparcelConfig, Dependency(skip_validation=True)],
         repository: Annotated[
             ShipmentRepository, Dependency(skip_validation=True)
         ],
+        flow: Annotated[ShipmentFlow, Dependency(skip_validation=True)],
     ) -> ShipmentResponse:
         """Fetch and persist latest provider shipment status."""
-        flow = ShipmentFlow(repository=repository, config=config.providers)
         try:
             shipment = await repository.get_by_id(shipment_id)
         except KeyError as exc:
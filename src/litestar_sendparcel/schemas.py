@@ -2,9 +2,36 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, TypedDict
 
-from pydantic import BaseModel
+import msgspec
+from pydantic import BaseModel, ConfigDict, with_config
+from sendparcel.types import AddressInfo
+
+
+@with_config(ConfigDict(extra="allow"))
+class Address(AddressInfo):
+    """Address payload, validated against the core ``AddressInfo`` fields.
+
+    Unknown keys are kept for providers that read extra address data.
+    """
+
+
+class _ParcelRequired(TypedDict):
+    weight_kg: float
+
+
+@with_config(ConfigDict(extra="allow"))
+class Parcel(_ParcelRequired, total=False):
+    """Parcel payload with the core ``ParcelInfo`` fields.
+
+    Measurements are floats rather than the core ``Decimal`` so the dicts
+    handed to providers stay JSON-serializable.
+    """
+
+    length_cm: float
+    width_cm: float
+    height_cm: float
 
 
 class CreateShipmentRequest(BaseModel):
@@ -13,17 +40,28 @@ class CreateShipmentRequest(BaseModel):
     The ``sender_address``, ``receiver_address``, and ``parcels`` fields
     are required for creating a shipment.  An optional ``reference_id``
     can be provided for external reference tracking.
+
+    The validator is built by ``create_shipping_router`` rather than at
+    import, so code that only imports the schemas does not pay for it.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     reference_id: str | None = None
     provider: str | None = None
-    sender_address: dict[str, Any] | None = None
-    receiver_address: dict[str, Any] | None = None
-    parcels: list[dict[str, Any]] | None = None
+    sender_address: Address | None = None
+    receiver_address: Address | None = None
+    parcels: list[Parcel] | None = None
+
 
+class ShipmentResponse(msgspec.Struct, frozen=True, gc=False):
+    """Serialized shipment response payload.
 
-class ShipmentResponse(BaseModel):
-    """Serialized shipment response payload."""
+    Response payloads are only ever built from trusted shipment data, so
+    they are msgspec structs that Litestar encodes without a validation
+    or ``model_dump`` pass.  They hold only strings and are never mutated,
+    so they are frozen and left untracked by the garbage collector.
+    """
 
     id: str
     status: str
@@ -35,16 +73,16 @@ class ShipmentResponse(BaseModel):
     @classmethod
     def from_shipment(cls, shipment: Any) -> ShipmentResponse:
         return cls(
-            id=str(shipment.id),
-            status=str(shipment.status),
-            provider=str(shipment.provider),
-            external_id=str(shipment.external_id),
-            tracking_number=str(shipment.tracking_number),
-            label_url=str(shipment.label_url),
+            str(shipment.id),
+            str(shipment.status),
+            str(shipment.provider),
+            str(shipment.external_id),
+            str(shipment.tracking_number),
+            str(shipment.label_url),
         )
 
 
-class CallbackResponse(BaseModel):
+class CallbackResponse(msgspec.Struct, frozen=True, gc=False):
     """Callback handling response payload."""
 
     provider: str
@@ -5,7 +5,9 @@ from __future__ import annotations
 from collections.abc import Iterator
 from dataclasses import dataclass
 
+import msgspec
 import pytest
+from httpx import Response
 from litestar import Litestar
 from litestar.testing import TestClient
 from sendparcel.exceptions import InvalidCallbackError
@@ -21,6 +23,23 @@ from sendparcel.registry import registry
 from litestar_sendparcel.config import SendparcelConfig
 from litestar_sendparcel.plugin import create_shipping_router
 
+DIRECT_PAYLOAD = {
+    "sender_address": {"country_code": "PL"},
+    "receiver_address": {"country_code": "DE"},
+    "parcels": [{"weight_kg": "1.0"}],
+}
+# Encoded once so the route tests post the same bytes instead of
+# re-serialising the dict on every request.
+DIRECT_PAYLOAD_JSON = msgspec.json.encode(DIRECT_PAYLOAD)
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def post_direct_shipment(client: TestClient) -> Response:
+    """POST the shared direct-mode payload to ``/shipments``."""
+    return client.post(
+        "/shipments", content=DIRECT_PAYLOAD_JSON, headers=_JSON_HEADERS
+    )
+
 
 @dataclass
 class DemoShipment:
@@ -33,7 +52,12 @@ class DemoShipment:
     label_url: str = ""
 
 
+_SHIPMENT_FIELDS = frozenset(DemoShipment.__dataclass_fields__)
+
+
 class InMemoryRepo:
+    __slots__ = ("_counter", "items")
+
     def __init__(self) -> None:
         self.items: dict[str, DemoShipment] = {}
         self._counter = 0
@@ -41,6 +65,9 @@ class InMemoryRepo:
     async def get_by_id(self, shipment_id: str) -> DemoShipment:
         return self.items[shipment_id]
 
+    async def get_many(self, ids) -> dict[str, DemoShipment]:
+        return {sid: self.items[sid] for sid in ids if sid in self.items}
+
     async def create(self, **kwargs) -> DemoShipment:
         self._counter += 1
         shipment_id = f"s-{self._counter}"
@@ -63,7 +90,8 @@ class InMemoryRepo:
         shipment = self.items[shipment_id]
         shipment.status = status
         for key, value in fields.items():
-            setattr(shipment, key, value)
+            if key in _SHIPMENT_FIELDS:
+                setattr(shipment, key, value)
         return shipment
 
     async def list_by_reference(self, reference_id: str) -> list[DemoShipment]:
@@ -71,12 +99,22 @@ class InMemoryRepo:
             s for s in self.items.values() if s.reference_id == reference_id
         ]
 
+    def clear(self) -> None:
+        self.items.clear()
+        self._counter = 0
+
 
 class RetryStore:
+    __slots__ = ("_counter", "events")
+
     def __init__(self) -> None:
         self.events: list[dict] = []
         self._counter = 0
 
+    def clear(self) -> None:
+        self.events.clear()
+        self._counter = 0
+
     async def enqueue(self, payload: dict) -> None:
         self.events.append(payload)
 
@@ -151,7 +189,9 @@ class DummyTestProvider(
 
 @pytest.fixture(autouse=True)
 def isolate_global_registry() -> Iterator[None]:
-    old = dict(registry._providers)
+    # The test gets a fresh dict, so the original can be restored by
+    # reference instead of being copied for every test.
+    old = registry._providers
     old_discovered = registry._discovered
     registry._providers = {}
     registry._discovered = True
@@ -162,28 +202,35 @@ def isolate_global_registry() -> Iterator[None]:
         registry._discovered = old_discovered
 
 
-@pytest.fixture()
+# The app, and the fakes it is wired to, are built once per session;
+# tests get them back emptied instead of paying for route compilation.
+@pytest.fixture(scope="session")
 def repository() -> InMemoryRepo:
     return InMemoryRepo()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def retry_store() -> RetryStore:
     return RetryStore()
 
 
-@pytest.fixture()
+@pytest.fixture(autouse=True)
+def _reset_fakes(repository: InMemoryRepo, retry_store: RetryStore) -> None:
+    repository.clear()
+    retry_store.clear()
+
+
+@pytest.fixture(scope="session")
 def config() -> SendparcelConfig:
     return SendparcelConfig(default_provider="test-dummy")
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def test_app(
     repository: InMemoryRepo,
     retry_store: RetryStore,
     config: SendparcelConfig,
 ) -> Litestar:
-    registry.register(DummyTestProvider)
     router = create_shipping_router(
         config=config,
         repository=repository,
@@ -192,30 +239,101 @@ def test_app(
     return Litestar(route_handlers=[router])
 
 
-@pytest.fixture()
-def client(test_app: Litestar) -> Iterator[TestClient]:
+@pytest.fixture(scope="session")
+def _session_client(test_app: Litestar) -> Iterator[TestClient]:
     with TestClient(app=test_app) as tc:
         yield tc
 
 
+@pytest.fixture()
+def client(_session_client: TestClient) -> TestClient:
+    # The global registry is reset around every test, so the provider is
+    # registered per test rather than when the shared app is built.
+    registry.register(DummyTestProvider)
+    _session_client.cookies.clear()
+    return _session_client
+
+
+# Shipments live in the shared repository, which is emptied before every
+# test, so these stay function-scoped.
+@pytest.fixture()
+def shipment_id(client: TestClient) -> str:
+    """A freshly created shipment's ID."""
+    resp = post_direct_shipment(client)
+    assert resp.status_code == 201, resp.text
+    return resp.json()["id"]
+
+
+@pytest.fixture()
+def labeled_shipment_id(client: TestClient, shipment_id: str) -> str:
+    """A shipment with a label, so the FSM allows mark_in_transit."""
+    client.post(f"/shipments/{shipment_id}/label")
+    return shipment_id
+
+
 # ---------------------------------------------------------------------------
 # SQLAlchemy fixtures (conditional)
 # ---------------------------------------------------------------------------
 
 _HAS_SQLALCHEMY = False
 try:
+    from sqlalchemy import event
     from sqlalchemy.ext.asyncio import (
         AsyncSession,
         async_sessionmaker,
         create_async_engine,
     )
 
+    from litestar_sendparcel.contrib.sqlalchemy.models import Base
+
     _HAS_SQLALCHEMY = True
 except ImportError:
     pass
 
 if _HAS_SQLALCHEMY:
 
+    def enable_sqlite_savepoints(engine) -> None:
+        """Let SQLAlchemy emit BEGIN itself on an aiosqlite engine.
+
+        Without this the driver commits around SAVEPOINTs, so data written
+        inside a per-test transaction would survive its rollback.
+        """
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_driver_transactions(dbapi_connection, _record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+    # The contrib schema is created once per test session; tests share the
+    # session event loop (see ``asyncio_default_test_loop_scope``).
+    @pytest.fixture(scope="session")
+    async def contrib_engine():
+        engine = create_async_engine("sqlite+aiosqlite://", echo=False)
+        enable_sqlite_savepoints(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield engine
+        await engine.dispose()
+
+    @pytest.fixture()
+    async def session_factory(contrib_engine):
+        """Sessions joined to one transaction, rolled back after the test.
+
+        Commits inside the test only release a SAVEPOINT, so each test
+        starts from empty tables without repeating the DDL.
+        """
+        async with contrib_engine.connect() as conn:
+            transaction = await conn.begin()
+            yield async_sessionmaker(
+                bind=conn,
+                class_=AsyncSession,
+                join_transaction_mode="create_savepoint",
+            )
+            await transaction.rollback()
+
     @pytest.fixture()
     async def async_engine():
         engine = create_async_engine("sqlite+aiosqlite://", echo=False)
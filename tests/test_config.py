@@ -3,7 +3,7 @@
 import pytest
 from pydantic import ValidationError
 
-from litestar_sendparcel.config import SendparcelConfig
+from litestar_sendparcel.config import SendparcelConfig, get_config
 
 
 def test_config_defaults():
@@ -12,6 +12,7 @@ def test_config_defaults():
     assert config.retry_max_attempts == 5
     assert config.retry_backoff_seconds == 60
     assert config.retry_enabled is True
+    assert config.retry_concurrency == 1
     assert config.providers == {}
 
 
@@ -37,6 +38,26 @@ def test_config_env_prefix(monkeypatch):
     assert config.retry_max_attempts == 10
 
 
+def test_get_config_reads_env_once(monkeypatch):
+    """get_config builds the env-backed config once and reuses it."""
+    monkeypatch.setenv("SENDPARCEL_DEFAULT_PROVIDER", "inpost")
+    get_config.cache_clear()
+    try:
+        config = get_config()
+        monkeypatch.setenv("SENDPARCEL_DEFAULT_PROVIDER", "dpd")
+        assert get_config() is config
+        assert config.default_provider == "inpost"
+    finally:
+        get_config.cache_clear()
+
+
+def test_config_is_frozen():
+    """Config cannot be mutated after construction."""
+    config = SendparcelConfig(default_provider="inpost")
+    with pytest.raises(ValidationError):
+        config.retry_enabled = False
+
+
 def test_default_provider_required():
     """Config must fail without default_provider."""
     with pytest.raises(ValidationError):
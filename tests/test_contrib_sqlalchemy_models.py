@@ -1,31 +1,16 @@
 """Tests for SQLAlchemy 2.0 async models."""
 
 import pytest
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.dialects import postgresql
 
 from litestar_sendparcel.contrib.sqlalchemy.models import (
-    Base,
     CallbackRetryModel,
     ShipmentModel,
 )
 
 
 @pytest.fixture
-async def engine():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield engine
-    await engine.dispose()
-
-
-@pytest.fixture
-async def session(engine):
-    session_factory = async_sessionmaker(engine, class_=AsyncSession)
+async def session(session_factory):
     async with session_factory() as session:
         yield session
 
@@ -97,3 +82,45 @@ async def test_callback_retry_model_create(session):
 async def test_callback_retry_model_table_name():
     """CallbackRetryModel uses correct table name."""
     assert CallbackRetryModel.__tablename__ == "sendparcel_callback_retries"
+
+
+async def test_callback_retry_model_has_due_index():
+    """Due-retry lookups are backed by a (status, next_retry_at) index."""
+    indexes = {
+        index.name: [column.name for column in index.columns]
+        for index in CallbackRetryModel.__table__.indexes
+    }
+    assert indexes["ix_sendparcel_callback_retries_status_next_retry_at"] == [
+        "status",
+        "next_retry_at",
+    ]
+
+
+async def test_callback_retry_json_columns_round_trip(session):
+    """Payload and headers survive a write/read through the JSON type."""
+    retry = CallbackRetryModel(
+        shipment_id="s-1",
+        provider_slug="dummy",
+        payload={"event": "picked_up", "items": [1, 2], "meta": None},
+        headers={"content-type": "application/json"},
+    )
+    session.add(retry)
+    await session.flush()
+    retry_id = retry.id
+    await session.commit()
+    session.expunge_all()
+
+    fetched = await session.get(CallbackRetryModel, retry_id)
+    assert fetched.payload == {
+        "event": "picked_up",
+        "items": [1, 2],
+        "meta": None,
+    }
+    assert fetched.headers == {"content-type": "application/json"}
+
+
+def test_callback_retry_json_columns_use_jsonb_on_postgresql():
+    """PostgreSQL stores retry payloads in native JSONB columns."""
+    dialect = postgresql.dialect()
+    column_type = CallbackRetryModel.__table__.c.payload.type
+    assert column_type.compile(dialect=dialect) == "JSONB"
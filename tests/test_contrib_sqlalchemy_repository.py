@@ -1,11 +1,8 @@
 """Tests for SQLAlchemy ShipmentRepository implementation."""
 
 import pytest
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from litestar_sendparcel.contrib.sqlalchemy.models import Base
 from litestar_sendparcel.contrib.sqlalchemy.repository import (
@@ -13,20 +10,6 @@ from litestar_sendparcel.contrib.sqlalchemy.repository import (
 )
 
 
-@pytest.fixture
-async def engine():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield engine
-    await engine.dispose()
-
-
-@pytest.fixture
-async def session_factory(engine):
-    return async_sessionmaker(engine, class_=AsyncSession)
-
-
 @pytest.fixture
 def repo(session_factory):
     return SQLAlchemyShipmentRepository(session_factory=session_factory)
@@ -45,6 +28,51 @@ async def test_create_shipment(repo):
     assert shipment.provider == "dummy"
 
 
+async def test_create_shipment_without_insert_returning(
+    repo, contrib_engine, monkeypatch
+):
+    """Dialects without INSERT ... RETURNING still get a loaded row back."""
+    monkeypatch.setattr(contrib_engine.dialect, "insert_returning", False)
+    inserts = []
+
+    def _record(conn, cursor, statement, *args):
+        if statement.startswith("INSERT"):
+            inserts.append(statement)
+
+    event.listen(contrib_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        shipment = await repo.create(provider="dummy", status="new")
+    finally:
+        event.remove(
+            contrib_engine.sync_engine, "before_cursor_execute", _record
+        )
+
+    assert len(inserts) == 1
+    assert "RETURNING" not in inserts[0]
+    assert shipment.status == "new"
+    assert shipment.created_at is not None
+
+
+async def test_bulk_create_shipments(repo):
+    """Repository creates several shipments in request order."""
+    shipments = await repo.bulk_create(
+        [
+            {"reference_id": "ref-1", "provider": "dummy", "status": "new"},
+            {"reference_id": "ref-2", "provider": "dummy"},
+        ]
+    )
+    assert [s.reference_id for s in shipments] == ["ref-1", "ref-2"]
+    assert [s.status for s in shipments] == ["new", "new"]
+
+    fetched = await repo.get_by_id(shipments[1].id)
+    assert fetched.reference_id == "ref-2"
+
+
+async def test_bulk_create_empty(repo):
+    """Bulk-creating nothing returns an empty list."""
+    assert await repo.bulk_create([]) == []
+
+
 async def test_get_by_id(repo):
     """Repository retrieves a shipment by ID."""
     created = await repo.create(
@@ -78,6 +106,21 @@ async def test_save_shipment(repo):
     assert fetched.external_id == "ext-123"
 
 
+async def test_detached_shipments_carry_server_timestamps(repo):
+    """Server-side timestamps are loaded before instances are detached."""
+    shipment = await repo.create(
+        reference_id="ref-1",
+        provider="dummy",
+        status="new",
+    )
+    assert shipment.created_at is not None
+    assert shipment.updated_at is not None
+
+    shipment.external_id = "ext-123"
+    saved = await repo.save(shipment)
+    assert saved.updated_at is not None
+
+
 async def test_update_status(repo):
     """Repository updates shipment status."""
     shipment = await repo.create(
@@ -91,6 +134,59 @@ async def test_update_status(repo):
     assert updated.status == "label_ready"
     assert updated.external_id == "ext-456"
 
+    fetched = await repo.get_by_id(shipment.id)
+    assert fetched.status == "label_ready"
+    assert fetched.external_id == "ext-456"
+
+
+async def test_update_status_ignores_unknown_fields(repo):
+    """Extra fields that are not shipment columns are skipped."""
+    shipment = await repo.create(provider="dummy", status="new")
+    updated = await repo.update_status(
+        shipment.id, "created", tracking_number="TRK-1", not_a_column=1
+    )
+    assert updated.tracking_number == "TRK-1"
+    assert not hasattr(updated, "not_a_column")
+
+
+async def test_update_status_not_found(repo):
+    """KeyError when updating a missing shipment."""
+    with pytest.raises(KeyError):
+        await repo.update_status("nonexistent", "label_ready")
+
+
+async def test_update_status_without_update_returning(
+    repo, contrib_engine, monkeypatch
+):
+    """Dialects without UPDATE ... RETURNING load, mutate and flush."""
+    monkeypatch.setattr(contrib_engine.dialect, "update_returning", False)
+    shipment = await repo.create(provider="dummy", status="new")
+    updates = []
+
+    def _record(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE"):
+            updates.append(statement)
+
+    event.listen(contrib_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        updated = await repo.update_status(
+            shipment.id, "label_ready", external_id="ext-456"
+        )
+    finally:
+        event.remove(
+            contrib_engine.sync_engine, "before_cursor_execute", _record
+        )
+
+    assert len(updates) == 1
+    assert "RETURNING" not in updates[0]
+    assert updated.status == "label_ready"
+    assert updated.external_id == "ext-456"
+    assert updated.updated_at is not None
+    fetched = await repo.get_by_id(shipment.id)
+    assert fetched.status == "label_ready"
+    with pytest.raises(KeyError):
+        await repo.update_status("nonexistent", "label_ready")
+
 
 async def test_list_by_reference(repo):
     """Repository lists shipments for a reference."""
@@ -119,3 +215,83 @@ async def test_list_by_reference_empty(repo):
     """Empty list when no shipments for reference."""
     shipments = await repo.list_by_reference("nonexistent")
     assert shipments == []
+
+
+async def test_list_by_references_groups_by_reference(repo):
+    """Shipments for several references are loaded and grouped at once."""
+    for reference_id, provider in (
+        ("ref-1", "dummy"),
+        ("ref-1", "inpost"),
+        ("ref-2", "dummy"),
+        ("ref-3", "dummy"),
+    ):
+        await repo.create(
+            reference_id=reference_id, provider=provider, status="new"
+        )
+
+    grouped = await repo.list_by_references(["ref-1", "ref-2", "missing"])
+
+    assert sorted(grouped) == ["ref-1", "ref-2"]
+    assert sorted(s.provider for s in grouped["ref-1"]) == ["dummy", "inpost"]
+    assert [s.reference_id for s in grouped["ref-2"]] == ["ref-2"]
+    assert await repo.list_by_references([]) == {}
+
+
+async def test_from_engine_shares_engine_pool():
+    """from_engine builds a working repository on the given engine."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        repo = SQLAlchemyShipmentRepository.from_engine(engine)
+        created = await repo.create(provider="dummy", status="new")
+        fetched = await repo.get_by_id(created.id)
+        assert fetched.id == created.id
+    finally:
+        await engine.dispose()
+
+
+async def test_session_factory_does_not_expire_on_commit(session_factory):
+    """Factories that expire on commit are copied, not reconfigured."""
+    assert session_factory.kw["expire_on_commit"] is True
+
+    repo = SQLAlchemyShipmentRepository(session_factory=session_factory)
+
+    assert repo._session_factory is not session_factory
+    assert repo._session_factory.kw["expire_on_commit"] is False
+    assert repo._session_factory.kw["bind"] is session_factory.kw["bind"]
+    assert session_factory.kw["expire_on_commit"] is True
+
+
+async def test_get_many(repo):
+    """Repository loads several shipments at once, skipping missing IDs."""
+    first = await repo.create(reference_id="ref-1", provider="dummy")
+    second = await repo.create(reference_id="ref-2", provider="dummy")
+
+    shipments = await repo.get_many([first.id, second.id, "missing"])
+
+    assert set(shipments) == {first.id, second.id}
+    assert shipments[second.id].reference_id == "ref-2"
+
+
+async def test_create_without_server_timestamp_defaults():
+    """Tables created by 0.1.0 have no database default for timestamps."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TABLE sendparcel_shipments ("
+            "id VARCHAR(36) PRIMARY KEY, reference_id VARCHAR(255) NOT NULL,"
+            " status VARCHAR(32) NOT NULL, provider VARCHAR(64) NOT NULL,"
+            " external_id VARCHAR(128) NOT NULL,"
+            " tracking_number VARCHAR(128) NOT NULL,"
+            " label_url VARCHAR(512) NOT NULL,"
+            " created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        )
+    try:
+        repo = SQLAlchemyShipmentRepository.from_engine(engine)
+        created = await repo.create(provider="dummy", status="new")
+        assert created.created_at is not None
+        updated = await repo.update_status(created.id, "label_ready")
+        assert updated.updated_at is not None
+    finally:
+        await engine.dispose()
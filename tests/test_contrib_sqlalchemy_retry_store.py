@@ -3,35 +3,13 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
 
-from litestar_sendparcel.contrib.sqlalchemy.models import (
-    Base,
-    CallbackRetryModel,
-)
+from litestar_sendparcel.contrib.sqlalchemy.models import CallbackRetryModel
 from litestar_sendparcel.contrib.sqlalchemy.retry_store import (
     SQLAlchemyRetryStore,
 )
 
 
-@pytest.fixture
-async def engine():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield engine
-    await engine.dispose()
-
-
-@pytest.fixture
-async def session_factory(engine):
-    return async_sessionmaker(engine, class_=AsyncSession)
-
-
 @pytest.fixture
 def store(session_factory):
     return SQLAlchemyRetryStore(
@@ -147,3 +125,36 @@ async def test_mark_exhausted(store, session_factory):
         retry = await session.get(CallbackRetryModel, retry_id)
         assert retry is not None
         assert retry.status == "exhausted"
+
+
+async def test_mark_many(store, session_factory):
+    """Applies a batch of transitions in order with one commit."""
+    ids = [
+        await store.store_failed_callback(
+            shipment_id=f"s-{i}",
+            provider_slug="dummy",
+            payload={},
+            headers={},
+        )
+        for i in range(3)
+    ]
+    await store.mark_many(
+        [
+            (ids[0], "succeeded", None),
+            (ids[1], "failed", "timeout"),
+            (ids[2], "failed", "still down"),
+            (ids[2], "exhausted", None),
+            ("missing", "succeeded", None),
+        ]
+    )
+
+    async with session_factory() as session:
+        first, second, third = [
+            await session.get(CallbackRetryModel, retry_id) for retry_id in ids
+        ]
+        assert first.status == "succeeded"
+        assert second.status == "pending"
+        assert second.attempts == 1
+        assert second.last_error == "timeout"
+        assert third.status == "exhausted"
+        assert third.last_error == "still down"
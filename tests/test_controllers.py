@@ -19,12 +19,12 @@ def test_callback_controller_is_controller():
 
 def test_shipment_controller_has_tags():
     """ShipmentController has tags set."""
-    assert ShipmentController.tags == ["shipments"]
+    assert ShipmentController.tags == ("shipments",)
 
 
 def test_callback_controller_has_tags():
     """CallbackController has tags set."""
-    assert CallbackController.tags == ["callbacks"]
+    assert CallbackController.tags == ("callbacks",)
 
 
 def test_callback_controller_has_path():
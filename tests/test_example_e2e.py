@@ -12,11 +12,9 @@ from litestar.testing import TestClient
 from sendparcel.flow import ShipmentFlow
 from sendparcel.registry import registry as core_registry
 from sendparcel.types import AddressInfo, ParcelInfo
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from conftest import enable_sqlite_savepoints
 
 # Add example directory to path so its modules can be imported directly.
 _example_dir = str(Path(__file__).resolve().parent.parent / "example")
@@ -27,6 +25,7 @@ from delivery_sim import (  # noqa: E402
     DeliverySimProvider,
     _build_label_pdf,
     _sim_state,
+    _SimState,
     sim_label,
 )
 from models import Base, Shipment, ShipmentRepository  # noqa: E402
@@ -50,22 +49,29 @@ RECEIVER = AddressInfo(
 PARCELS = [ParcelInfo(weight_kg=Decimal("2.5"))]
 
 
-@pytest.fixture()
-async def db_session():
-    """In-memory async SQLAlchemy session with example models."""
+@pytest.fixture(scope="session")
+async def example_engine():
+    """In-memory engine with the example schema, created once."""
     engine = create_async_engine("sqlite+aiosqlite://", echo=False)
+    enable_sqlite_savepoints(engine)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
 
-    session_factory = async_sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with session_factory() as session:
-        yield session
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    await engine.dispose()
+@pytest.fixture()
+async def db_session(example_engine):
+    """Session inside a per-test transaction that is rolled back."""
+    async with example_engine.connect() as conn:
+        transaction = await conn.begin()
+        async with AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
+        await transaction.rollback()
 
 
 @pytest.fixture(autouse=True)
@@ -174,6 +180,33 @@ class TestFullParcelDispatchFlow:
         assert _sim_state[sid] == "created"
 
 
+class TestSimState:
+    """Unit-level tests for the bounded simulator state store."""
+
+    def test_evicts_oldest_entry_past_maxsize(self):
+        """Writing past maxsize drops the least recently written entry."""
+        state = _SimState(maxsize=2)
+        state["1"] = "created"
+        state["2"] = "created"
+        state["1"] = "label_ready"
+        state["3"] = "created"
+        assert list(state) == ["1", "3"]
+        assert state.get("2") is None
+
+
+class TestShipmentModel:
+    """Unit-level tests for the example Shipment model."""
+
+    def test_accepts_iso_country_code(self):
+        shipment = Shipment(sender_country_code="DE")
+        assert shipment.sender_country_code == "DE"
+
+    @pytest.mark.parametrize("code", ["pl", "POL", ""])
+    def test_rejects_malformed_country_code(self, code):
+        with pytest.raises(ValueError, match="receiver_country_code"):
+            Shipment(receiver_country_code=code)
+
+
 class TestLabelPdfGeneration:
     """Unit-level tests for _build_label_pdf."""
 
@@ -205,14 +238,19 @@ class TestLabelPdfGeneration:
         assert len(pdf_bytes) > 200
 
 
+@pytest.fixture(scope="module")
+def label_client():
+    """One client for the label endpoint, shared by its tests."""
+    with TestClient(app=Litestar(route_handlers=[sim_label])) as client:
+        yield client
+
+
 class TestLabelEndpoint:
     """Test the label PDF HTTP endpoint via Litestar TestClient."""
 
-    def test_label_endpoint_returns_pdf(self):
+    def test_label_endpoint_returns_pdf(self, label_client):
         """GET /sim/label/{id}.pdf returns a valid PDF response."""
-        app = Litestar(route_handlers=[sim_label])
-        with TestClient(app=app) as client:
-            response = client.get("/sim/label/42.pdf")
+        response = label_client.get("/sim/label/42.pdf")
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
@@ -221,23 +259,36 @@ class TestLabelEndpoint:
         assert "content-disposition" in response.headers
         assert "label-42.pdf" in response.headers["content-disposition"]
 
-    def test_label_endpoint_strips_pdf_extension(self):
+    def test_label_endpoint_strips_pdf_extension(self, label_client):
         """The endpoint strips .pdf suffix so the label text contains
         the clean id only."""
-        app = Litestar(route_handlers=[sim_label])
-        with TestClient(app=app) as client:
-            response = client.get("/sim/label/test-id.pdf")
+        response = label_client.get("/sim/label/test-id.pdf")
 
         assert response.status_code == 200
         # Label text embeds clean id, not "test-id.pdf"
         assert b"test-id" in response.content
 
-    def test_label_endpoint_without_pdf_suffix(self):
+    def test_label_endpoint_without_pdf_suffix(self, label_client):
         """Endpoint also works when called without .pdf suffix."""
-        app = Litestar(route_handlers=[sim_label])
-        with TestClient(app=app) as client:
-            response = client.get("/sim/label/99")
+        response = label_client.get("/sim/label/99")
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
         assert b"99" in response.content
+
+    def test_label_endpoint_sets_cache_headers(self, label_client):
+        """Labels are deterministic, so they are served as cacheable."""
+        response = label_client.get("/sim/label/42.pdf")
+
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"].startswith('"')
+
+    def test_label_endpoint_returns_304_for_matching_etag(self, label_client):
+        """A matching If-None-Match short-circuits with 304 Not Modified."""
+        etag = label_client.get("/sim/label/42.pdf").headers["etag"]
+        response = label_client.get(
+            "/sim/label/42.pdf", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
@@ -1,5 +1,8 @@
 """Tests for exception-to-HTTP-response mapping."""
 
+from collections.abc import Iterator
+
+import pytest
 from litestar import Litestar, get
 from litestar.testing import TestClient
 from sendparcel.exceptions import (
@@ -9,6 +12,7 @@ from sendparcel.exceptions import (
     SendParcelException,
 )
 
+from litestar_sendparcel import exceptions
 from litestar_sendparcel.exceptions import (
     EXCEPTION_HANDLERS,
     ConfigurationError,
@@ -16,110 +20,88 @@ from litestar_sendparcel.exceptions import (
 )
 
 
-def test_sendparcel_exception_returns_400():
-    """SendParcelException maps to 400."""
+class GatewayTimeout(CommunicationError):
+    pass
 
-    @get("/test")
-    async def handler() -> None:
-        raise SendParcelException("bad request")
 
-    app = Litestar(
-        route_handlers=[handler],
-        exception_handlers=EXCEPTION_HANDLERS,
-    )
-    with TestClient(app) as client:
-        resp = client.get("/test")
-        assert resp.status_code == 400
-        data = resp.json()
-        assert data["detail"] == "bad request"
-        assert data["code"] == "sendparcel_error"
+# Each test raises its exception from its own path on one shared app.
+_ERRORS = {
+    "sendparcel": lambda: SendParcelException("bad request"),
+    "communication": lambda: CommunicationError("gateway down"),
+    "invalid-callback": lambda: InvalidCallbackError("bad signature"),
+    "invalid-transition": lambda: InvalidTransitionError("wrong state"),
+    "not-found": lambda: ShipmentNotFoundError("ship-123"),
+    "configuration": lambda: ConfigurationError("missing order resolver"),
+    "subclass": lambda: GatewayTimeout("timed out"),
+}
 
 
-def test_communication_error_returns_502():
-    """CommunicationError maps to 502."""
+@get("/raise/{name:str}")
+async def raise_error(name: str) -> None:
+    raise _ERRORS[name]()
 
-    @get("/test")
-    async def handler() -> None:
-        raise CommunicationError("gateway down")
 
+@pytest.fixture(scope="module")
+def client() -> Iterator[TestClient]:
     app = Litestar(
-        route_handlers=[handler],
+        route_handlers=[raise_error],
         exception_handlers=EXCEPTION_HANDLERS,
     )
-    with TestClient(app) as client:
-        resp = client.get("/test")
-        assert resp.status_code == 502
-        assert resp.json()["code"] == "communication_error"
+    with TestClient(app) as tc:
+        yield tc
 
 
-def test_invalid_callback_returns_400():
-    """InvalidCallbackError maps to 400."""
+def test_sendparcel_exception_returns_400(client):
+    """SendParcelException maps to 400."""
+    resp = client.get("/raise/sendparcel")
+    assert resp.status_code == 400
+    data = resp.json()
+    assert data["detail"] == "bad request"
+    assert data["code"] == "sendparcel_error"
 
-    @get("/test")
-    async def handler() -> None:
-        raise InvalidCallbackError("bad signature")
 
-    app = Litestar(
-        route_handlers=[handler],
-        exception_handlers=EXCEPTION_HANDLERS,
-    )
-    with TestClient(app) as client:
-        resp = client.get("/test")
-        assert resp.status_code == 400
-        assert resp.json()["code"] == "invalid_callback"
+def test_communication_error_returns_502(client):
+    """CommunicationError maps to 502."""
+    resp = client.get("/raise/communication")
+    assert resp.status_code == 502
+    assert resp.json()["code"] == "communication_error"
 
 
-def test_invalid_transition_returns_409():
-    """InvalidTransitionError maps to 409."""
+def test_invalid_callback_returns_400(client):
+    """InvalidCallbackError maps to 400."""
+    resp = client.get("/raise/invalid-callback")
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "invalid_callback"
 
-    @get("/test")
-    async def handler() -> None:
-        raise InvalidTransitionError("wrong state")
 
-    app = Litestar(
-        route_handlers=[handler],
-        exception_handlers=EXCEPTION_HANDLERS,
-    )
-    with TestClient(app) as client:
-        resp = client.get("/test")
-        assert resp.status_code == 409
-        assert resp.json()["code"] == "invalid_transition"
+def test_invalid_transition_returns_409(client):
+    """InvalidTransitionError maps to 409."""
+    resp = client.get("/raise/invalid-transition")
+    assert resp.status_code == 409
+    assert resp.json()["code"] == "invalid_transition"
 
 
-def test_shipment_not_found_returns_404():
+def test_shipment_not_found_returns_404(client):
     """ShipmentNotFoundError maps to 404."""
-
-    @get("/test")
-    async def handler() -> None:
-        raise ShipmentNotFoundError("ship-123")
-
-    app = Litestar(
-        route_handlers=[handler],
-        exception_handlers=EXCEPTION_HANDLERS,
-    )
-    with TestClient(app) as client:
-        resp = client.get("/test")
-        assert resp.status_code == 404
-        data = resp.json()
-        assert data["code"] == "not_found"
-        assert "ship-123" in data["detail"]
+    resp = client.get("/raise/not-found")
+    assert resp.status_code == 404
+    data = resp.json()
+    assert data["code"] == "not_found"
+    assert "ship-123" in data["detail"]
 
 
-def test_configuration_error_returns_500():
+def test_configuration_error_returns_500(client):
     """ConfigurationError maps to 500."""
+    resp = client.get("/raise/configuration")
+    assert resp.status_code == 500
+    assert resp.json()["code"] == "configuration_error"
 
-    @get("/test")
-    async def handler() -> None:
-        raise ConfigurationError("missing order resolver")
 
-    app = Litestar(
-        route_handlers=[handler],
-        exception_handlers=EXCEPTION_HANDLERS,
-    )
-    with TestClient(app) as client:
-        resp = client.get("/test")
-        assert resp.status_code == 500
-        assert resp.json()["code"] == "configuration_error"
+def test_exception_subclass_uses_closest_mapping(client):
+    """Subclasses map like their nearest registered base class."""
+    resp = client.get("/raise/subclass")
+    assert resp.status_code == 502
+    assert resp.json()["code"] == "communication_error"
 
 
 def test_exception_handlers_is_dict():
@@ -130,3 +112,21 @@ def test_exception_handlers_is_dict():
         assert isinstance(exc_type, type)
         assert issubclass(exc_type, Exception)
         assert callable(handler)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "handle_communication_error",
+        "handle_invalid_callback",
+        "handle_invalid_transition",
+        "handle_shipment_not_found",
+        "handle_configuration_error",
+        "handle_sendparcel_exception",
+    ],
+)
+def test_per_exception_handler_names_still_importable(name):
+    """The 0.1.0 handler names map exceptions like handle_exception."""
+    handler = getattr(exceptions, name)
+    response = handler(None, ShipmentNotFoundError("ship-123"))
+    assert response.status_code == 404
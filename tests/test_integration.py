@@ -4,12 +4,7 @@ from __future__ import annotations
 
 from litestar.testing import TestClient
 
-
-_DIRECT_PAYLOAD = {
-    "sender_address": {"country_code": "PL"},
-    "receiver_address": {"country_code": "DE"},
-    "parcels": [{"weight_kg": "1.0"}],
-}
+from conftest import post_direct_shipment
 
 
 class TestFullShipmentFlow:
@@ -18,7 +13,7 @@ class TestFullShipmentFlow:
     def test_create_label_status_flow(self, client: TestClient) -> None:
         """Create shipment, create label, fetch status -- full happy path."""
         # Step 1: Create shipment
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
+        created = post_direct_shipment(client)
         assert created.status_code == 201
         shipment_id = created.json()["id"]
         assert created.json()["status"] == "created"
@@ -37,7 +32,7 @@ class TestFullShipmentFlow:
 
     def test_create_label_callback_flow(self, client: TestClient) -> None:
         """Create, label, then callback -- verify status progresses."""
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
+        created = post_direct_shipment(client)
         shipment_id = created.json()["id"]
 
         client.post(f"/shipments/{shipment_id}/label")
@@ -54,7 +49,7 @@ class TestFullShipmentFlow:
         self, client: TestClient, retry_store
     ) -> None:
         """Bad callback token returns 400 and does NOT enqueue retry."""
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
+        created = post_direct_shipment(client)
         shipment_id = created.json()["id"]
 
         resp = client.post(
@@ -1,7 +1,14 @@
 """Plugin tests."""
 
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
 from litestar import Litestar, Router
 from litestar.testing import TestClient
+from sendparcel.flow import ShipmentFlow
 
 from litestar_sendparcel.config import SendparcelConfig
 from litestar_sendparcel.exceptions import EXCEPTION_HANDLERS
@@ -22,41 +29,33 @@ class _Repo:
         raise NotImplementedError
 
 
-def test_create_shipping_router_returns_router() -> None:
-    router = create_shipping_router(
+@pytest.fixture(scope="module")
+def router() -> Router:
+    """A default router, built once for the tests that only inspect it."""
+    return create_shipping_router(
         config=SendparcelConfig(default_provider="dummy"),
         repository=_Repo(),
     )
 
+
+def test_create_shipping_router_returns_router(router: Router) -> None:
     assert isinstance(router, Router)
 
 
-def test_router_has_exception_handlers() -> None:
+def test_router_has_exception_handlers(router: Router) -> None:
     """Router includes EXCEPTION_HANDLERS."""
-    router = create_shipping_router(
-        config=SendparcelConfig(default_provider="dummy"),
-        repository=_Repo(),
-    )
     for exc_type, handler_fn in EXCEPTION_HANDLERS.items():
         assert exc_type in router.exception_handlers
         assert router.exception_handlers[exc_type] is handler_fn
 
 
-def test_router_has_route_handlers() -> None:
+def test_router_has_route_handlers(router: Router) -> None:
     """Router should include both ShipmentController and CallbackController."""
-    router = create_shipping_router(
-        config=SendparcelConfig(default_provider="dummy"),
-        repository=_Repo(),
-    )
     assert len(router.routes) > 0
 
 
-def test_health_endpoint_accessible() -> None:
+def test_health_endpoint_accessible(router: Router) -> None:
     """Health endpoint returns 200 with status ok."""
-    router = create_shipping_router(
-        config=SendparcelConfig(default_provider="dummy"),
-        repository=_Repo(),
-    )
     app = Litestar(route_handlers=[router])
     with TestClient(app=app) as client:
         resp = client.get("/shipments/health")
@@ -64,11 +63,75 @@ def test_health_endpoint_accessible() -> None:
         assert resp.json() == {"status": "ok"}
 
 
-def test_dependencies_include_config_and_repository() -> None:
+def test_openapi_documents_create_shipment_body(router: Router) -> None:
+    """POST /shipments advertises CreateShipmentRequest as its body."""
+    schema = Litestar(route_handlers=[router]).openapi_schema.to_schema()
+    body = schema["paths"]["/shipments"]["post"]["requestBody"]
+    assert body["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/CreateShipmentRequest"
+    }
+    assert "CreateShipmentRequest" in schema["components"]["schemas"]
+
+
+def test_dependencies_include_config_and_repository(router: Router) -> None:
     """Router dependencies must include config and repository."""
-    router = create_shipping_router(
-        config=SendparcelConfig(default_provider="dummy"),
-        repository=_Repo(),
-    )
     assert "config" in router.dependencies
     assert "repository" in router.dependencies
+
+
+def test_flow_dependency_is_shared() -> None:
+    """One ShipmentFlow is built per router and reused for every request."""
+    repository = _Repo()
+    config = SendparcelConfig(
+        default_provider="dummy", providers={"dummy": {"key": "v"}}
+    )
+    router = create_shipping_router(config=config, repository=repository)
+
+    provide = router.dependencies["flow"]
+    flow = provide.dependency()
+    assert isinstance(flow, ShipmentFlow)
+    assert provide.dependency() is flow
+    assert flow.repository is repository
+    assert flow.config == {"dummy": {"key": "v"}}
+
+
+def test_retry_store_dependency_only_when_configured() -> None:
+    """An unset retry store registers no per-request provider."""
+    config = SendparcelConfig(default_provider="dummy")
+    without_store = create_shipping_router(config=config, repository=_Repo())
+    assert "retry_store" not in without_store.dependencies
+
+    store = object()
+    with_store = create_shipping_router(
+        config=config, repository=_Repo(), retry_store=store
+    )
+    assert with_store.dependencies["retry_store"].dependency() is store
+
+
+def test_dependencies_cache_their_values(router: Router) -> None:
+    """Fixed dependencies are cached instead of resolved per request."""
+    for name in ("config", "repository", "flow", "registry"):
+        provide = router.dependencies[name]
+        assert provide.use_cache, name
+        assert provide.has_sync_callable, name
+
+
+def test_router_builds_deferred_request_validator() -> None:
+    """The request schema is only built once a router is created."""
+    src = Path(__file__).resolve().parents[1] / "src"
+    code = (
+        "from litestar_sendparcel.config import SendparcelConfig\n"
+        "from litestar_sendparcel.plugin import create_shipping_router\n"
+        "from litestar_sendparcel.schemas import CreateShipmentRequest\n"
+        "assert not CreateShipmentRequest.__pydantic_complete__\n"
+        "create_shipping_router(\n"
+        "    config=SendparcelConfig(default_provider='dummy'),\n"
+        "    repository=object(),\n"
+        ")\n"
+        "assert CreateShipmentRequest.__pydantic_complete__\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(src)},
+    )
@@ -1,25 +1,22 @@
 """Tests for protocol definitions."""
 
-from litestar_sendparcel.protocols import CallbackRetryStore
+from litestar_sendparcel.protocols import (
+    BulkShipmentRepository,
+    CallbackRetryStore,
+)
 
 
-def test_callback_retry_store_has_all_methods():
-    """CallbackRetryStore protocol defines the full lifecycle."""
-    method_names = [
+def test_callback_retry_store_protocol():
+    """CallbackRetryStore defines the lifecycle and is runtime-checkable."""
+    method_names = (
         "store_failed_callback",
         "get_due_retries",
         "mark_succeeded",
         "mark_failed",
         "mark_exhausted",
-    ]
-    for method_name in method_names:
-        assert hasattr(CallbackRetryStore, method_name), (
-            f"CallbackRetryStore missing method: {method_name}"
-        )
-
-
-def test_callback_retry_store_is_runtime_checkable():
-    """CallbackRetryStore can be used with isinstance()."""
+    )
+    missing = [m for m in method_names if not hasattr(CallbackRetryStore, m)]
+    assert not missing, f"CallbackRetryStore missing methods: {missing}"
 
     class GoodStore:
         async def store_failed_callback(
@@ -44,3 +41,18 @@ def test_callback_retry_store_is_runtime_checkable():
             pass
 
     assert isinstance(GoodStore(), CallbackRetryStore)
+
+
+def test_bulk_shipment_repository_is_runtime_checkable():
+    """Repositories opt into batched reads by defining get_many."""
+
+    class BulkRepo:
+        async def get_many(self, ids):
+            return {}
+
+    class PlainRepo:
+        async def get_by_id(self, shipment_id):
+            raise KeyError(shipment_id)
+
+    assert isinstance(BulkRepo(), BulkShipmentRepository)
+    assert not isinstance(PlainRepo(), BulkShipmentRepository)
@@ -1,12 +1,18 @@
 # tests/test_public_api.py
 """Tests for public API surface."""
 
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
 import litestar_sendparcel
 
+_SRC = Path(__file__).resolve().parents[1] / "src"
+_PY_TYPED = _SRC / "litestar_sendparcel" / "py.typed"
+
 
 def test_version_is_set():
     """Package exposes __version__."""
@@ -16,13 +22,7 @@ def test_version_is_set():
 
 def test_py_typed_marker_exists():
     """PEP 561 py.typed marker file exists."""
-    marker = (
-        Path(__file__).resolve().parents[1]
-        / "src"
-        / "litestar_sendparcel"
-        / "py.typed"
-    )
-    assert marker.exists()
+    assert _PY_TYPED.exists()
 
 
 def test_all_exports_are_importable():
@@ -32,34 +32,40 @@ def test_all_exports_are_importable():
         assert attr is not None, f"{name} resolved to None"
 
 
-def test_lazy_import_config():
-    """SendparcelConfig is lazily importable."""
-    cls = litestar_sendparcel.SendparcelConfig
-    assert cls.__name__ == "SendparcelConfig"
-
-
-def test_lazy_import_router_factory():
-    """create_shipping_router is lazily importable."""
-    fn = litestar_sendparcel.create_shipping_router
-    assert callable(fn)
-
-
-def test_lazy_import_exceptions():
-    """Exception classes are lazily importable."""
-    assert litestar_sendparcel.ShipmentNotFoundError is not None
-    assert litestar_sendparcel.ConfigurationError is not None
-
-
-def test_lazy_import_protocols():
-    """Protocol classes are lazily importable."""
-    assert litestar_sendparcel.CallbackRetryStore is not None
+def test_package_import_does_not_load_settings_stack():
+    """Importing the package defers pydantic-settings until config use."""
+    code = (
+        "import sys, litestar_sendparcel; "
+        "assert 'pydantic_settings' not in sys.modules"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(_SRC)},
+    )
 
 
-def test_lazy_import_schemas():
-    """Schema classes are lazily importable."""
-    assert litestar_sendparcel.CreateShipmentRequest is not None
-    assert litestar_sendparcel.ShipmentResponse is not None
-    assert litestar_sendparcel.CallbackResponse is not None
+@pytest.mark.parametrize(
+    "name",
+    [
+        "SendparcelConfig",
+        "create_shipping_router",
+        "LitestarPluginRegistry",
+        "ShipmentNotFoundError",
+        "ConfigurationError",
+        "CallbackRetryStore",
+        "BatchCallbackRetryStore",
+        "BulkShipmentRepository",
+        "Address",
+        "Parcel",
+        "CreateShipmentRequest",
+        "ShipmentResponse",
+        "CallbackResponse",
+    ],
+)
+def test_lazy_import(name):
+    """Public names resolve lazily to the objects they are named after."""
+    assert getattr(litestar_sendparcel, name).__name__ == name
 
 
 def test_getattr_raises_for_unknown():
@@ -19,27 +19,54 @@ class _FakeProvider(BaseProvider):
         return {}
 
 
+@pytest.fixture()
+def reg() -> LitestarPluginRegistry:
+    # Marked as discovered so lookups never scan installed entry points.
+    reg = LitestarPluginRegistry()
+    reg._discovered = True
+    return reg
+
+
 class TestLitestarPluginRegistry:
     def test_inherits_plugin_registry(self) -> None:
         assert issubclass(LitestarPluginRegistry, PluginRegistry)
 
-    def test_register_and_get_by_slug(self) -> None:
-        reg = LitestarPluginRegistry()
+    def test_register_and_get_by_slug(
+        self, reg: LitestarPluginRegistry
+    ) -> None:
         reg.register(_FakeProvider)
         assert reg.get_by_slug("fake-reg") is _FakeProvider
 
-    def test_get_by_slug_missing_raises(self) -> None:
-        reg = LitestarPluginRegistry()
-        reg._discovered = True
+    def test_get_by_slug_missing_raises(
+        self, reg: LitestarPluginRegistry
+    ) -> None:
         with pytest.raises(KeyError):
             reg.get_by_slug("nonexistent")
 
-    def test_register_provider_router(self) -> None:
-        reg = LitestarPluginRegistry()
+    def test_register_provider_router(
+        self, reg: LitestarPluginRegistry
+    ) -> None:
         sentinel = object()
         reg.register_provider_router("test-slug", sentinel)
         assert reg.get_provider_router("test-slug") is sentinel
 
-    def test_get_provider_router_missing_returns_none(self) -> None:
-        reg = LitestarPluginRegistry()
+    def test_get_provider_router_missing_returns_none(
+        self, reg: LitestarPluginRegistry
+    ) -> None:
+        assert reg.get_provider_router("nonexistent") is None
+
+    def test_freeze_keeps_routers_readable(
+        self, reg: LitestarPluginRegistry
+    ) -> None:
+        sentinel = object()
+        reg.register_provider_router("test-slug", sentinel)
+        reg.freeze()
+        assert reg.get_provider_router("test-slug") is sentinel
         assert reg.get_provider_router("nonexistent") is None
+
+    def test_register_provider_router_after_freeze_raises(
+        self, reg: LitestarPluginRegistry
+    ) -> None:
+        reg.freeze()
+        with pytest.raises(RuntimeError):
+            reg.register_provider_router("test-slug", object())
@@ -1,28 +1,156 @@
 # tests/test_retry.py
 """Tests for the webhook retry mechanism."""
 
+import logging
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, patch
+from types import MappingProxyType, SimpleNamespace
 
+import anyio
 import pytest
+from sendparcel.exceptions import InvalidCallbackError
 
 from litestar_sendparcel.config import SendparcelConfig
-from litestar_sendparcel.retry import compute_next_retry_at, process_due_retries
+from litestar_sendparcel.retry import (
+    compute_next_retry_at,
+    enqueue_callback_retry,
+    process_due_retries,
+)
+
+
+class _StubRetryStore:
+    """Retry store that serves preset due retries and records outcomes."""
+
+    def __init__(self, due=()):
+        self.due = list(due)
+        self.stored = []
+        self.succeeded = []
+        self.failed = []
+        self.exhausted = []
+
+    async def store_failed_callback(
+        self, shipment_id, provider_slug, payload, headers
+    ):
+        self.stored.append(
+            {
+                "shipment_id": shipment_id,
+                "provider_slug": provider_slug,
+                "payload": payload,
+                "headers": headers,
+            }
+        )
+        return f"retry-{len(self.stored)}"
+
+    async def get_due_retries(self, limit=10):
+        return self.due[:limit]
+
+    async def mark_succeeded(self, retry_id):
+        self.succeeded.append(retry_id)
+
+    async def mark_failed(self, retry_id, error):
+        self.failed.append((retry_id, error))
+
+    async def mark_exhausted(self, retry_id):
+        self.exhausted.append(retry_id)
+
+
+class _StubRepo:
+    """Repository serving preset shipments; unknown IDs raise KeyError."""
+
+    def __init__(self, shipments=None):
+        self.shipments = dict(shipments or {})
+        self.lookups = []
+
+    async def get_by_id(self, shipment_id):
+        self.lookups.append(shipment_id)
+        return self.shipments[shipment_id]
+
+    async def create(self, **kwargs):
+        raise NotImplementedError
+
+    async def save(self, shipment):
+        raise NotImplementedError
+
+    async def update_status(self, shipment_id, status, **fields):
+        raise NotImplementedError
+
+
+class _StubBulkRepo(_StubRepo):
+    def __init__(self, shipments=None):
+        super().__init__(shipments)
+        self.bulk_lookups = []
+
+    async def get_many(self, ids):
+        self.bulk_lookups.append(list(ids))
+        return {
+            sid: self.shipments[sid] for sid in ids if sid in self.shipments
+        }
+
+
+class _StubFlow:
+    """ShipmentFlow stand-in; replays raise ``side_effect`` when it is set.
+
+    Calling the stub, as retry processing does to build its flow, counts
+    the construction and returns the stub itself.
+    """
+
+    def __init__(self):
+        self.side_effect = None
+        self.created = 0
+
+    def __call__(self, **kwargs):
+        self.created += 1
+        return self
+
+    async def handle_callback(self, shipment, payload, headers):
+        if self.side_effect is not None:
+            raise self.side_effect
+
+
+# Retry processing only passes the shipment through to the patched flow.
+_SHIPMENT = SimpleNamespace(id="s-1", provider="dummy")
+
+
+class _StubBatchStore:
+    """Retry store that takes every outcome in a single mark_many call."""
+
+    def __init__(self, due=()):
+        self.due = list(due)
+        self.batches = []
+
+    async def get_due_retries(self, limit=10):
+        return self.due[:limit]
+
+    async def mark_many(self, transitions):
+        self.batches.append(list(transitions))
+
+
+def _due(shipment_id="s-1", attempts=1, retry_id="retry-1"):
+    return {
+        "id": retry_id,
+        "shipment_id": shipment_id,
+        "provider_slug": "dummy",
+        "payload": {"event": "picked_up"},
+        "headers": {},
+        "attempts": attempts,
+    }
+
+
+@pytest.fixture
+def stub_store():
+    return _StubRetryStore()
 
 
 @pytest.fixture
-def mock_retry_store():
-    store = AsyncMock()
-    store.get_due_retries = AsyncMock(return_value=[])
-    store.mark_succeeded = AsyncMock()
-    store.mark_failed = AsyncMock()
-    store.mark_exhausted = AsyncMock()
-    return store
+def stub_repo():
+    return _StubRepo()
 
 
 @pytest.fixture
-def mock_repo():
-    return AsyncMock()
+def patched_flow(monkeypatch):
+    """Replace ShipmentFlow with a stub and return it."""
+    flow = _StubFlow()
+    monkeypatch.setattr("litestar_sendparcel.retry.ShipmentFlow", flow)
+    return flow
 
 
 @pytest.fixture
@@ -35,173 +163,283 @@ def config():
     )
 
 
+_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
 def test_compute_backoff():
     """Backoff increases exponentially."""
     base = 10
-    t1 = compute_next_retry_at(attempt=1, backoff_seconds=base)
-    t2 = compute_next_retry_at(attempt=2, backoff_seconds=base)
-    t3 = compute_next_retry_at(attempt=3, backoff_seconds=base)
+    t1 = compute_next_retry_at(attempt=1, backoff_seconds=base, now=_NOW)
+    t2 = compute_next_retry_at(attempt=2, backoff_seconds=base, now=_NOW)
+    t3 = compute_next_retry_at(attempt=3, backoff_seconds=base, now=_NOW)
 
-    now = datetime.now(tz=UTC)
-    assert t1 > now
-    assert t2 > t1
-    assert t3 > t2
+    assert _NOW < t1 < t2 < t3
 
 
 def test_compute_backoff_first_attempt():
-    """First attempt backoff is base_seconds."""
-    now = datetime.now(tz=UTC)
+    """First attempt backoff is base_seconds from the current time."""
+    before = datetime.now(tz=UTC)
     result = compute_next_retry_at(attempt=1, backoff_seconds=60)
-    expected_min = now + timedelta(seconds=55)
-    expected_max = now + timedelta(seconds=65)
-    assert expected_min < result < expected_max
+    after = datetime.now(tz=UTC)
+    delay = timedelta(seconds=60)
+    assert before + delay <= result <= after + delay
+
+
+def test_compute_backoff_doubles_per_attempt():
+    """Each attempt waits twice as long as the previous one."""
+    delays = [
+        compute_next_retry_at(attempt=attempt, backoff_seconds=10, now=_NOW)
+        - _NOW
+        for attempt in (1, 2, 3)
+    ]
+    assert delays == [timedelta(seconds=s) for s in (10, 20, 40)]
 
 
-async def test_process_retries_empty(mock_retry_store, mock_repo, config):
+async def test_process_retries_empty(stub_store, stub_repo, config):
     """No retries to process — does nothing."""
     processed = await process_due_retries(
-        retry_store=mock_retry_store,
-        repository=mock_repo,
+        retry_store=stub_store,
+        repository=stub_repo,
         config=config,
     )
     assert processed == 0
 
 
-async def test_process_retries_success(mock_retry_store, mock_repo, config):
-    """Successful retry marks as succeeded."""
-    shipment = AsyncMock()
-    shipment.id = "s-1"
-    shipment.provider = "dummy"
-    mock_repo.get_by_id = AsyncMock(return_value=shipment)
+@pytest.mark.parametrize(
+    ("attempts", "side_effect", "outcome"),
+    [
+        (1, None, "succeeded"),
+        (1, Exception("still failing"), "failed"),
+        (3, Exception("still failing"), "exhausted"),
+    ],
+    ids=["success", "failure_under_max", "exhausted"],
+)
+async def test_process_retries_outcome(
+    patched_flow, config, attempts, side_effect, outcome
+):
+    """A replayed retry is marked according to its result and attempts."""
+    store = _StubRetryStore(due=[_due(attempts=attempts)])
+    repo = _StubRepo({"s-1": _SHIPMENT})
+    patched_flow.side_effect = side_effect
 
-    mock_retry_store.get_due_retries = AsyncMock(
-        return_value=[
-            {
-                "id": "retry-1",
-                "shipment_id": "s-1",
-                "provider_slug": "dummy",
-                "payload": {"event": "picked_up"},
-                "headers": {},
-                "attempts": 1,
-            }
-        ]
+    processed = await process_due_retries(
+        retry_store=store,
+        repository=repo,
+        config=config,
     )
 
-    with patch("litestar_sendparcel.retry.ShipmentFlow") as mock_flow_cls:
-        instance = AsyncMock()
-        mock_flow_cls.return_value = instance
-        instance.handle_callback = AsyncMock()
+    assert processed == 1
+    marked = [
+        entry[0] if isinstance(entry, tuple) else entry
+        for entry in getattr(store, outcome)
+    ]
+    assert marked == ["retry-1"]
 
-        processed = await process_due_retries(
-            retry_store=mock_retry_store,
-            repository=mock_repo,
-            config=config,
-        )
+
+async def test_process_retries_shipment_not_found(stub_repo, config):
+    """Retry for missing shipment is marked exhausted."""
+    store = _StubRetryStore(due=[_due()])
+
+    processed = await process_due_retries(
+        retry_store=store,
+        repository=stub_repo,
+        config=config,
+    )
 
     assert processed == 1
-    mock_retry_store.mark_succeeded.assert_called_once_with("retry-1")
+    assert store.exhausted == ["retry-1"]
+
+
+async def test_process_retries_respects_concurrency_limit(patched_flow):
+    """No more than retry_concurrency callbacks are replayed at once."""
+    config = SendparcelConfig(
+        default_provider="dummy",
+        providers={"dummy": {}},
+        retry_concurrency=2,
+    )
+    store = _StubRetryStore(
+        due=[_due(f"s-{i}", retry_id=f"retry-{i}") for i in range(5)]
+    )
+    repo = _StubRepo({f"s-{i}": SimpleNamespace() for i in range(5)})
+    running = 0
+    peak = 0
+
+    async def handle_callback(*args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await anyio.sleep(0.01)
+        running -= 1
+
+    patched_flow.handle_callback = handle_callback
+
+    processed = await process_due_retries(
+        retry_store=store,
+        repository=repo,
+        config=config,
+    )
+
+    assert processed == 5
+    assert peak == 2
+    assert len(store.succeeded) == 5
+    assert patched_flow.created == 1
+
+
+async def test_enqueue_callback_retry_stores_headers_as_dict(stub_store):
+    """Header views are copied into a plain dict at the storage boundary."""
+    await enqueue_callback_retry(
+        stub_store,
+        provider_slug="dummy",
+        shipment_id="s-1",
+        payload={"event": "picked_up"},
+        headers=MappingProxyType({"x-token": "abc"}),
+        reason="gateway down",
+    )
+
+    stored = stub_store.stored[0]["headers"]
+    assert type(stored) is dict
+    assert stored == {"x-token": "abc"}
+
+
+async def test_process_retries_loads_shipments_in_bulk(patched_flow, config):
+    """Repositories with get_many are read once for the whole batch."""
+    store = _StubRetryStore(
+        due=[_due(sid, retry_id=f"retry-{sid}") for sid in ("s-1", "s-2")]
+    )
+    repo = _StubBulkRepo({"s-1": _SHIPMENT})
+
+    processed = await process_due_retries(
+        retry_store=store,
+        repository=repo,
+        config=config,
+    )
+
+    assert processed == 2
+    assert repo.bulk_lookups == [["s-1", "s-2"]]
+    assert repo.lookups == []
+    assert store.succeeded == ["retry-s-1"]
+    assert store.exhausted == ["retry-s-2"]
 
 
-async def test_process_retries_failure_under_max(
-    mock_retry_store, mock_repo, config
+async def test_process_retries_logs_one_batch_summary(
+    stub_repo, config, caplog
 ):
-    """Failed retry under max_attempts marks as failed."""
-    shipment = AsyncMock()
-    shipment.id = "s-1"
-    shipment.provider = "dummy"
-    mock_repo.get_by_id = AsyncMock(return_value=shipment)
-
-    mock_retry_store.get_due_retries = AsyncMock(
-        return_value=[
-            {
-                "id": "retry-1",
-                "shipment_id": "s-1",
-                "provider_slug": "dummy",
-                "payload": {"event": "picked_up"},
-                "headers": {},
-                "attempts": 1,
-            }
+    """Per-retry outcomes are summarised in a single INFO record."""
+    store = _StubRetryStore(due=[_due()])
+
+    with caplog.at_level(logging.INFO, logger="litestar_sendparcel.retry"):
+        await process_due_retries(
+            retry_store=store,
+            repository=stub_repo,
+            config=config,
+        )
+
+    info = [r for r in caplog.records if r.levelno == logging.INFO]
+    assert [r.getMessage() for r in info] == [
+        "Processed 1 callback retries: 0 succeeded, 0 failed, 1 exhausted"
+    ]
+
+
+async def test_process_retries_flushes_batch_store_once(patched_flow, config):
+    """Stores with mark_many receive all outcomes in a single call."""
+    store = _StubBatchStore(
+        due=[
+            _due(f"s-{i}", attempts=attempts, retry_id=f"retry-{i}")
+            for i, attempts in enumerate((1, 3))
         ]
     )
+    repo = _StubRepo({"s-0": SimpleNamespace(), "s-1": SimpleNamespace()})
+
+    processed = await process_due_retries(
+        retry_store=store,
+        repository=repo,
+        config=config,
+    )
+
+    assert processed == 2
+    assert len(store.batches) == 1
+    assert sorted(store.batches[0]) == [
+        ("retry-0", "succeeded", None),
+        ("retry-1", "exhausted", None),
+    ]
 
-    with patch("litestar_sendparcel.retry.ShipmentFlow") as mock_flow_cls:
-        instance = AsyncMock()
-        mock_flow_cls.return_value = instance
-        instance.handle_callback = AsyncMock(
-            side_effect=Exception("still failing")
-        )
 
-        processed = await process_due_retries(
-            retry_store=mock_retry_store,
-            repository=mock_repo,
+async def test_process_retries_flushes_batch_store_when_a_retry_raises(
+    patched_flow, config
+):
+    """An unexpected error does not stop or discard the rest of the batch."""
+
+    class BrokenRepo(_StubRepo):
+        async def get_by_id(self, shipment_id):
+            if shipment_id == "s-0":
+                raise RuntimeError("database unavailable")
+            return await super().get_by_id(shipment_id)
+
+    store = _StubBatchStore(
+        due=[_due(f"s-{i}", retry_id=f"retry-{i}") for i in range(3)]
+    )
+    repo = BrokenRepo({"s-1": SimpleNamespace(), "s-2": SimpleNamespace()})
+
+    with pytest.raises(RuntimeError, match="database unavailable"):
+        await process_due_retries(
+            retry_store=store,
+            repository=repo,
             config=config,
         )
 
-    assert processed == 1
-    mock_retry_store.mark_failed.assert_called_once()
+    assert len(store.batches) == 1
+    assert sorted(store.batches[0]) == [
+        ("retry-1", "succeeded", None),
+        ("retry-2", "succeeded", None),
+    ]
+
 
+async def test_process_retries_flushes_batch_store_when_cancelled(
+    patched_flow, config
+):
+    """Outcomes recorded before a cancellation are still written."""
 
-async def test_process_retries_exhausted(mock_retry_store, mock_repo, config):
-    """Failed retry at max_attempts marks as exhausted."""
-    shipment = AsyncMock()
-    shipment.id = "s-1"
-    shipment.provider = "dummy"
-    mock_repo.get_by_id = AsyncMock(return_value=shipment)
+    class SlowBatchStore(_StubBatchStore):
+        async def mark_many(self, transitions):
+            await anyio.sleep(0)
+            await super().mark_many(transitions)
 
-    mock_retry_store.get_due_retries = AsyncMock(
-        return_value=[
-            {
-                "id": "retry-1",
-                "shipment_id": "s-1",
-                "provider_slug": "dummy",
-                "payload": {"event": "picked_up"},
-                "headers": {},
-                "attempts": 3,
-            }
-        ]
+    stuck = SimpleNamespace()
+    store = SlowBatchStore(
+        due=[_due(f"s-{i}", retry_id=f"retry-{i}") for i in range(2)]
     )
+    repo = _StubRepo({"s-0": SimpleNamespace(), "s-1": stuck})
 
-    with patch("litestar_sendparcel.retry.ShipmentFlow") as mock_flow_cls:
-        instance = AsyncMock()
-        mock_flow_cls.return_value = instance
-        instance.handle_callback = AsyncMock(
-            side_effect=Exception("still failing")
-        )
+    async def handle_callback(shipment, payload, headers):
+        if shipment is stuck:
+            await anyio.sleep_forever()
+
+    patched_flow.handle_callback = handle_callback
 
-        processed = await process_due_retries(
-            retry_store=mock_retry_store,
-            repository=mock_repo,
+    with anyio.move_on_after(0.05):
+        await process_due_retries(
+            retry_store=store,
+            repository=repo,
             config=config,
         )
 
-    assert processed == 1
-    mock_retry_store.mark_exhausted.assert_called_once_with("retry-1")
+    assert store.batches == [[("retry-0", "succeeded", None)]]
 
 
-async def test_process_retries_shipment_not_found(
-    mock_retry_store, mock_repo, config
+async def test_process_retries_invalid_callback_is_not_retried(
+    patched_flow, config
 ):
-    """Retry for missing shipment is marked exhausted."""
-    mock_repo.get_by_id = AsyncMock(side_effect=KeyError("s-1"))
+    """A rejected callback is dead-lettered on its first failed replay."""
+    store = _StubRetryStore(due=[_due()])
+    repo = _StubRepo({"s-1": _SHIPMENT})
 
-    mock_retry_store.get_due_retries = AsyncMock(
-        return_value=[
-            {
-                "id": "retry-1",
-                "shipment_id": "s-1",
-                "provider_slug": "dummy",
-                "payload": {},
-                "headers": {},
-                "attempts": 1,
-            }
-        ]
-    )
+    patched_flow.side_effect = InvalidCallbackError("bad signature")
 
-    processed = await process_due_retries(
-        retry_store=mock_retry_store,
-        repository=mock_repo,
+    await process_due_retries(
+        retry_store=store,
+        repository=repo,
         config=config,
     )
 
-    assert processed == 1
-    mock_retry_store.mark_exhausted.assert_called_once_with("retry-1")
+    assert store.failed == [("retry-1", "bad signature")]
+    assert store.exhausted == ["retry-1"]
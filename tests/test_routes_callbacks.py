@@ -2,32 +2,20 @@
 
 from __future__ import annotations
 
+import pytest
 from litestar.testing import TestClient
 
-
-_DIRECT_PAYLOAD = {
-    "sender_address": {"country_code": "PL"},
-    "receiver_address": {"country_code": "DE"},
-    "parcels": [{"weight_kg": "1.0"}],
-}
+from conftest import DemoShipment, DummyTestProvider, InMemoryRepo
 
 
 class TestCallbackRoute:
     """Test POST /callbacks/{provider_slug}/{shipment_id}."""
 
-    def _create_shipment(self, client: TestClient) -> str:
-        """Helper: create a shipment and return its ID."""
-        resp = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        assert resp.status_code == 201, resp.text
-        return resp.json()["id"]
-
-    def test_callback_happy_path(self, client: TestClient) -> None:
-        shipment_id = self._create_shipment(client)
-        # Create label first so FSM allows mark_in_transit
-        client.post(f"/shipments/{shipment_id}/label")
-
+    def test_callback_happy_path(
+        self, client: TestClient, labeled_shipment_id: str
+    ) -> None:
         resp = client.post(
-            f"/callbacks/test-dummy/{shipment_id}",
+            f"/callbacks/test-dummy/{labeled_shipment_id}",
             json={"event": "picked_up"},
             headers={"x-test-token": "valid"},
         )
@@ -37,9 +25,8 @@ class TestCallbackRoute:
         assert body["status"] == "accepted"
 
     def test_callback_invalid_token_returns_400(
-        self, client: TestClient
+        self, client: TestClient, shipment_id: str
     ) -> None:
-        shipment_id = self._create_shipment(client)
         resp = client.post(
             f"/callbacks/test-dummy/{shipment_id}",
             json={"event": "test"},
@@ -48,9 +35,8 @@ class TestCallbackRoute:
         assert resp.status_code == 400
 
     def test_callback_provider_mismatch_returns_400(
-        self, client: TestClient
+        self, client: TestClient, shipment_id: str
     ) -> None:
-        shipment_id = self._create_shipment(client)
         resp = client.post(
             f"/callbacks/wrong-provider/{shipment_id}",
             json={"event": "test"},
@@ -69,13 +55,10 @@ class TestCallbackRoute:
         assert resp.status_code == 404
 
     def test_callback_response_includes_shipment_status(
-        self, client: TestClient
+        self, client: TestClient, labeled_shipment_id: str
     ) -> None:
-        shipment_id = self._create_shipment(client)
-        client.post(f"/shipments/{shipment_id}/label")
-
         resp = client.post(
-            f"/callbacks/test-dummy/{shipment_id}",
+            f"/callbacks/test-dummy/{labeled_shipment_id}",
             json={"event": "transit"},
             headers={"x-test-token": "valid"},
         )
@@ -83,13 +66,41 @@ class TestCallbackRoute:
         assert "shipment_status" in resp.json()
 
     def test_callback_invalid_token_does_not_enqueue_retry(
-        self, client: TestClient, retry_store
+        self, client: TestClient, retry_store, shipment_id: str
     ) -> None:
         """InvalidCallbackError is NOT retried - only CommunicationError is."""
-        shipment_id = self._create_shipment(client)
         client.post(
             f"/callbacks/test-dummy/{shipment_id}",
             json={"event": "test"},
             headers={"x-test-token": "WRONG"},
         )
         assert len(retry_store.events) == 0
+
+    def test_callback_passes_headers_to_provider_as_dict(
+        self,
+        client: TestClient,
+        repository: InMemoryRepo,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Providers get a plain dict, per the sendparcel provider contract."""
+        seen = []
+
+        async def verify_callback(self, data, headers, **kwargs):
+            seen.append(headers)
+
+        monkeypatch.setattr(
+            DummyTestProvider, "verify_callback", verify_callback
+        )
+        repository.items["s-1"] = DemoShipment(
+            id="s-1", status="label_ready", provider="test-dummy"
+        )
+
+        client.post(
+            "/callbacks/test-dummy/s-1",
+            json={"event": "picked_up"},
+            headers={"x-test-token": "valid"},
+        )
+
+        assert len(seen) == 1
+        assert type(seen[0]) is dict
+        assert seen[0]["x-test-token"] == "valid"
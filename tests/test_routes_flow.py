@@ -1,5 +1,8 @@
 """Flow-backed route integration tests."""
 
+from collections.abc import Iterator
+
+import pytest
 from litestar import Litestar
 from litestar.testing import TestClient
 from sendparcel.exceptions import CommunicationError, InvalidCallbackError
@@ -12,17 +15,11 @@ from sendparcel.provider import (
 )
 from sendparcel.registry import registry
 
+from conftest import post_direct_shipment
 from litestar_sendparcel.config import SendparcelConfig
 from litestar_sendparcel.plugin import create_shipping_router
 
 
-_DIRECT_PAYLOAD = {
-    "sender_address": {"country_code": "PL"},
-    "receiver_address": {"country_code": "DE"},
-    "parcels": [{"weight_kg": "1.0"}],
-}
-
-
 class DummyProvider(
     BaseProvider,
     LabelProvider,
@@ -60,62 +57,69 @@ class DummyProvider(
         return True
 
 
-def _create_client(repo, retry_store):
-    registry.register(DummyProvider)
+# Each app is built once per module; the conftest fakes it is wired to
+# are emptied before every test.
+@pytest.fixture(scope="module")
+def _dummy_client(repository, retry_store) -> Iterator[TestClient]:
     router = create_shipping_router(
         config=SendparcelConfig(
             default_provider="dummy",
             providers={"dummy": {"status_override": "in_transit"}},
         ),
-        repository=repo,
+        repository=repository,
         retry_store=retry_store,
     )
-    app = Litestar(route_handlers=[router])
-    return TestClient(app=app)
-
-
-def test_create_label_status_and_callback_flow(repository, retry_store) -> None:
-    client = _create_client(repository, retry_store)
+    with TestClient(app=Litestar(route_handlers=[router])) as client:
+        yield client
 
-    with client:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        assert created.status_code == 201
-        shipment_id = created.json()["id"]
-        assert created.json()["status"] == "created"
 
-        label = client.post(f"/shipments/{shipment_id}/label")
-        assert label.status_code == 201
-        assert label.json()["status"] == "label_ready"
+@pytest.fixture()
+def dummy_client(_dummy_client: TestClient) -> TestClient:
+    # The global registry is reset around every test.
+    registry.register(DummyProvider)
+    return _dummy_client
 
-        status = client.get(f"/shipments/{shipment_id}/status")
-        assert status.status_code == 200
-        assert status.json()["status"] == "in_transit"
 
-        callback = client.post(
-            f"/callbacks/dummy/{shipment_id}",
-            headers={"x-dummy-token": "ok"},
-            json={"event": "picked_up"},
-        )
-        assert callback.status_code == 201
+def test_create_label_status_and_callback_flow(
+    dummy_client: TestClient,
+) -> None:
+    created = post_direct_shipment(dummy_client)
+    assert created.status_code == 201
+    shipment_id = created.json()["id"]
+    assert created.json()["status"] == "created"
+
+    label = dummy_client.post(f"/shipments/{shipment_id}/label")
+    assert label.status_code == 201
+    assert label.json()["status"] == "label_ready"
+
+    status = dummy_client.get(f"/shipments/{shipment_id}/status")
+    assert status.status_code == 200
+    assert status.json()["status"] == "in_transit"
+
+    callback = dummy_client.post(
+        f"/callbacks/dummy/{shipment_id}",
+        headers={"x-dummy-token": "ok"},
+        json={"event": "picked_up"},
+    )
+    assert callback.status_code == 201
 
 
-def test_callback_invalid_token_returns_400(repository, retry_store) -> None:
+def test_callback_invalid_token_returns_400(
+    dummy_client: TestClient, retry_store
+) -> None:
     """InvalidCallbackError should NOT enqueue a retry."""
-    client = _create_client(repository, retry_store)
-
-    with client:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        shipment_id = created.json()["id"]
-        client.post(f"/shipments/{shipment_id}/label")
-
-        callback = client.post(
-            f"/callbacks/dummy/{shipment_id}",
-            headers={"x-dummy-token": "bad"},
-            json={"event": "picked_up"},
-        )
+    created = post_direct_shipment(dummy_client)
+    shipment_id = created.json()["id"]
+    dummy_client.post(f"/shipments/{shipment_id}/label")
+
+    callback = dummy_client.post(
+        f"/callbacks/dummy/{shipment_id}",
+        headers={"x-dummy-token": "bad"},
+        json={"event": "picked_up"},
+    )
 
-        assert callback.status_code == 400
-        assert len(retry_store.events) == 0
+    assert callback.status_code == 400
+    assert len(retry_store.events) == 0
 
 
 class FailingProvider(
@@ -155,57 +159,57 @@ class FailingProvider(
         return True
 
 
-def _create_failing_client(repo, retry_store):
-    registry.register(FailingProvider)
+@pytest.fixture(scope="module")
+def _failing_client(repository, retry_store) -> Iterator[TestClient]:
     router = create_shipping_router(
         config=SendparcelConfig(
             default_provider="failing",
             providers={"failing": {}},
         ),
-        repository=repo,
+        repository=repository,
         retry_store=retry_store,
     )
-    app = Litestar(route_handlers=[router])
-    return TestClient(app=app)
+    with TestClient(app=Litestar(route_handlers=[router])) as client:
+        yield client
+
+
+@pytest.fixture()
+def failing_client(_failing_client: TestClient) -> TestClient:
+    registry.register(FailingProvider)
+    return _failing_client
 
 
 def test_communication_error_enqueues_retry_and_returns_502(
-    repository, retry_store
+    failing_client: TestClient, retry_store
 ) -> None:
     """CommunicationError should enqueue retry and return 502."""
-    client = _create_failing_client(repository, retry_store)
-
-    with client:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        shipment_id = created.json()["id"]
-        client.post(f"/shipments/{shipment_id}/label")
-
-        callback = client.post(
-            f"/callbacks/failing/{shipment_id}",
-            headers={"x-token": "ok"},
-            json={"event": "picked_up"},
-        )
+    created = post_direct_shipment(failing_client)
+    shipment_id = created.json()["id"]
+    failing_client.post(f"/shipments/{shipment_id}/label")
+
+    callback = failing_client.post(
+        f"/callbacks/failing/{shipment_id}",
+        headers={"x-token": "ok"},
+        json={"event": "picked_up"},
+    )
 
-        assert callback.status_code == 502
-        assert len(retry_store.events) == 1
+    assert callback.status_code == 502
+    assert len(retry_store.events) == 1
 
 
 def test_invalid_callback_does_not_enqueue_retry(
-    repository, retry_store
+    dummy_client: TestClient, retry_store
 ) -> None:
     """InvalidCallbackError should NOT enqueue a retry."""
-    client = _create_client(repository, retry_store)
-
-    with client:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        shipment_id = created.json()["id"]
-        client.post(f"/shipments/{shipment_id}/label")
-
-        callback = client.post(
-            f"/callbacks/dummy/{shipment_id}",
-            headers={"x-dummy-token": "bad"},
-            json={"event": "picked_up"},
-        )
+    created = post_direct_shipment(dummy_client)
+    shipment_id = created.json()["id"]
+    dummy_client.post(f"/shipments/{shipment_id}/label")
+
+    callback = dummy_client.post(
+        f"/callbacks/dummy/{shipment_id}",
+        headers={"x-dummy-token": "bad"},
+        json={"event": "picked_up"},
+    )
 
-        assert callback.status_code == 400
-        assert len(retry_store.events) == 0
+    assert callback.status_code == 400
+    assert len(retry_store.events) == 0
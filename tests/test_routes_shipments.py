@@ -2,21 +2,10 @@
 
 from __future__ import annotations
 
-from litestar import Litestar
+import pytest
 from litestar.testing import TestClient
-from sendparcel.registry import registry
 
-from litestar_sendparcel.config import SendparcelConfig
-from litestar_sendparcel.plugin import create_shipping_router
-
-from conftest import DummyTestProvider, InMemoryRepo
-
-
-_DIRECT_PAYLOAD = {
-    "sender_address": {"country_code": "PL"},
-    "receiver_address": {"country_code": "DE"},
-    "parcels": [{"weight_kg": "1.0"}],
-}
+from conftest import DIRECT_PAYLOAD, post_direct_shipment
 
 
 class TestShipmentsHealthRoute:
@@ -28,7 +17,7 @@ class TestShipmentsHealthRoute:
 
 class TestCreateShipmentRoute:
     def test_create_shipment_returns_201(self, client: TestClient) -> None:
-        resp = client.post("/shipments", json=_DIRECT_PAYLOAD)
+        resp = post_direct_shipment(client)
         assert resp.status_code == 201
         body = resp.json()
         assert "id" in body
@@ -40,33 +29,28 @@ class TestCreateShipmentRoute:
     ) -> None:
         resp = client.post(
             "/shipments",
-            json={**_DIRECT_PAYLOAD, "provider": "test-dummy"},
+            json={**DIRECT_PAYLOAD, "provider": "test-dummy"},
         )
         assert resp.status_code == 201
         assert resp.json()["provider"] == "test-dummy"
 
 
 class TestCreateLabelRoute:
-    def test_create_label_returns_201(self, client: TestClient) -> None:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        shipment_id = created.json()["id"]
+    def test_create_label_returns_201(
+        self, client: TestClient, shipment_id: str
+    ) -> None:
         resp = client.post(f"/shipments/{shipment_id}/label")
         assert resp.status_code == 201
-        assert resp.json()["status"] == "label_ready"
-
-    def test_create_label_sets_label_url(self, client: TestClient) -> None:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        shipment_id = created.json()["id"]
-        resp = client.post(f"/shipments/{shipment_id}/label")
-        assert resp.json()["label_url"] != ""
+        body = resp.json()
+        assert body["status"] == "label_ready"
+        assert body["label_url"] != ""
 
 
 class TestFetchStatusRoute:
-    def test_fetch_status_returns_200(self, client: TestClient) -> None:
-        created = client.post("/shipments", json=_DIRECT_PAYLOAD)
-        shipment_id = created.json()["id"]
-        client.post(f"/shipments/{shipment_id}/label")
-        resp = client.get(f"/shipments/{shipment_id}/status")
+    def test_fetch_status_returns_200(
+        self, client: TestClient, labeled_shipment_id: str
+    ) -> None:
+        resp = client.get(f"/shipments/{labeled_shipment_id}/status")
         assert resp.status_code == 200
         assert "status" in resp.json()
 
@@ -76,28 +60,44 @@ class TestDirectShipmentCreation:
 
     def test_create_shipment_direct(self, client: TestClient) -> None:
         """POST /shipments with sender/receiver/parcels creates shipment."""
-        resp = client.post("/shipments", json=_DIRECT_PAYLOAD)
+        resp = post_direct_shipment(client)
         assert resp.status_code == 201
         body = resp.json()
         assert body["status"] == "created"
         assert body["provider"] == "test-dummy"
 
-    def test_create_shipment_partial_direct_fields_returns_500(
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {
+                "sender_address": {"country_code": "PL"},
+                "receiver_address": {"country_code": "DE"},
+            },
+            {},
+        ],
+        ids=["partial_direct_fields", "empty_body"],
+    )
+    def test_create_shipment_missing_direct_fields_returns_500(
+        self, client: TestClient, body: dict
+    ) -> None:
+        """Bodies without all direct fields return 500 (ConfigurationError)."""
+        resp = client.post("/shipments", json=body)
+        assert resp.status_code == 500
+
+    def test_create_shipment_malformed_body_returns_400(
         self, client: TestClient
     ) -> None:
-        """Partial direct fields (missing parcels) returns 500."""
+        """Malformed JSON is rejected before reaching the flow."""
         resp = client.post(
             "/shipments",
-            json={
-                "sender_address": {"country_code": "PL"},
-                "receiver_address": {"country_code": "DE"},
-            },
+            content=b"{not json",
+            headers={"content-type": "application/json"},
         )
-        assert resp.status_code == 500
+        assert resp.status_code == 400
 
-    def test_create_shipment_empty_body_returns_500(
+    def test_create_shipment_invalid_field_type_returns_400(
         self, client: TestClient
     ) -> None:
-        """Empty request body returns 500 (ConfigurationError)."""
-        resp = client.post("/shipments", json={})
-        assert resp.status_code == 500
+        """Fields of the wrong type fail validation with 400."""
+        resp = client.post("/shipments", json={"parcels": "not-a-list"})
+        assert resp.status_code == 400
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 
 import pytest
@@ -14,6 +15,16 @@ from litestar_sendparcel.schemas import (
 )
 
 
+@dataclass
+class FakeShipment:
+    id: str = "s-1"
+    status: str = "created"
+    provider: str = "dummy"
+    external_id: str = "ext-1"
+    tracking_number: str = "TRK-1"
+    label_url: str = ""
+
+
 class TestCreateShipmentRequest:
     def test_empty_request_is_valid(self) -> None:
         """All fields are optional -- empty request is accepted."""
@@ -46,6 +57,30 @@ class TestCreateShipmentRequest:
         assert req.receiver_address == {"country_code": "DE"}
         assert req.parcels == [{"weight_kg": 1.0}]
 
+    def test_parcel_values_stay_json_native(self) -> None:
+        req = CreateShipmentRequest.model_validate_json(
+            b'{"parcels": [{"weight_kg": 1.5, "length_cm": "20"}]}'
+        )
+        assert req.parcels == [{"weight_kg": 1.5, "length_cm": 20.0}]
+        assert json.loads(json.dumps(req.parcels)) == req.parcels
+
+    def test_parcel_without_weight_rejected(self) -> None:
+        with pytest.raises(ValidationError):
+            CreateShipmentRequest(parcels=[{"length_cm": 10}])
+
+    def test_address_extra_keys_kept(self) -> None:
+        req = CreateShipmentRequest(
+            sender_address={"country_code": "PL", "locker_id": "WAW01"}
+        )
+        assert req.sender_address == {
+            "country_code": "PL",
+            "locker_id": "WAW01",
+        }
+
+    def test_address_field_types_validated(self) -> None:
+        with pytest.raises(ValidationError):
+            CreateShipmentRequest(sender_address={"country_code": 48})
+
 
 class TestShipmentResponse:
     def test_all_fields_accepted(self) -> None:
@@ -61,19 +96,15 @@ class TestShipmentResponse:
         assert resp.status == "created"
 
     def test_missing_field_raises(self) -> None:
-        with pytest.raises(ValidationError):
+        with pytest.raises(TypeError):
             ShipmentResponse(id="s-1", status="created")
 
-    def test_from_shipment_classmethod(self) -> None:
-        @dataclass
-        class FakeShipment:
-            id: str = "s-1"
-            status: str = "created"
-            provider: str = "dummy"
-            external_id: str = "ext-1"
-            tracking_number: str = "TRK-1"
-            label_url: str = ""
+    def test_is_immutable(self) -> None:
+        resp = ShipmentResponse("s-1", "created", "dummy", "", "", "")
+        with pytest.raises(AttributeError):
+            resp.status = "label_ready"
 
+    def test_from_shipment_classmethod(self) -> None:
         resp = ShipmentResponse.from_shipment(FakeShipment())
         assert resp.id == "s-1"
         assert resp.provider == "dummy"
@@ -90,5 +121,5 @@ class TestCallbackResponse:
         assert resp.provider == "dummy"
 
     def test_missing_field_raises(self) -> None:
-        with pytest.raises(ValidationError):
+        with pytest.raises(TypeError):
             CallbackResponse(provider="dummy")